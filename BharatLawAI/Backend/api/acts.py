@@ -1,17 +1,117 @@
 
+import base64
+import hashlib
 import json
-from fastapi import APIRouter
+import os
+import threading
+from typing import Literal, Optional
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
 router = APIRouter()
 
+ACTS_FILE = "data/cleaned_acts.jsonl"
+MAX_PAGE_SIZE = 1000
+NDJSON_CHUNK = 256  # acts per streamed write
+
+# (version, parsed acts, raw JSON lines) — swapped as one tuple so readers never see a mix
+_snapshot = (None, [], [])
+_reload_lock = threading.Lock()
+
 def load_acts_from_jsonl(file_path):
-    acts = []
-    with open(file_path, 'r') as f:
+    acts, lines = [], []
+    with open(file_path, 'r', encoding='utf-8') as f:
         for line in f:
+            line = line.strip()
+            if not line:
+                continue
             acts.append(json.loads(line))
-    return acts
+            lines.append(line)
+    return acts, lines
+
+def get_cached_acts(file_path=ACTS_FILE):
+    """Return (version, acts, lines), re-reading the file only when its mtime or size changes."""
+    global _snapshot
+    stat = os.stat(file_path)
+    version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    if _snapshot[0] != version:
+        with _reload_lock:
+            if _snapshot[0] != version:
+                acts, lines = load_acts_from_jsonl(file_path)
+                _snapshot = (version, acts, lines)
+    return _snapshot
+
+def project(act, fields):
+    """Keep only the requested (optionally dotted) fields, e.g. "metadata.heading"."""
+    out = {}
+    for path in fields:
+        keys = path.split(".")
+        value = act
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = out
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = value
+    return out
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        offset = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Same bound as the `offset` parameter; a negative start would wrap the slice
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset
 
 @router.get("/acts")
-async def get_acts():
-    acts = load_acts_from_jsonl("data/cleaned_acts.jsonl")
-    return acts
+def get_acts(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from a previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. metadata.heading,text"),
+    fmt: Literal["json", "ndjson"] = Query("json", alias="format"),
+    if_none_match: Optional[str] = Header(None),
+):
+    version, acts, lines = get_cached_acts()
+
+    if cursor is not None:
+        offset = decode_cursor(cursor)
+    total = len(acts)
+    end = total if limit is None else min(offset + limit, total)
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else []
+
+    # ETag covers both the file version and the slice/projection that was asked for
+    query_key = f"{offset}:{end}:{','.join(field_list)}:{fmt}"
+    etag = f'W/"{version}-{hashlib.md5(query_key.encode()).hexdigest()[:12]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "X-Total-Count": str(total),
+    }
+    if end < total:
+        headers["X-Next-Cursor"] = encode_cursor(end)
+
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    # Untouched acts are served from the raw file lines, skipping re-serialization
+    if field_list:
+        page = [json.dumps(project(act, field_list), ensure_ascii=False) for act in acts[offset:end]]
+    else:
+        page = lines[offset:end]
+
+    if fmt == "ndjson":
+        def stream():
+            for i in range(0, len(page), NDJSON_CHUNK):
+                yield "\n".join(page[i:i + NDJSON_CHUNK]) + "\n"
+        return StreamingResponse(stream(), media_type="application/x-ndjson", headers=headers)
+
+    return Response(content="[" + ",".join(page) + "]", media_type="application/json", headers=headers)
@@ -3,15 +3,18 @@
 from fastapi import APIRouter, Request
 from pydantic import BaseModel
 from rag.query_engine import query_legal_assistant
+from rag.metrics import ERRORS
+from rag.logs import get_logger
 
 router = APIRouter()
+log = get_logger("api.routes")
 
 class ChatRequest(BaseModel):
     question: str
 
 class ChatResponse(BaseModel):
     answer: str
-    source: str  # e.g., "vector_db" or "fallback_llm"
+    source: str  # e.g., "vector_db", "exact_citation", "cache_exact", "cache_semantic" or "fallback_llm"
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(payload: ChatRequest):
@@ -20,10 +23,11 @@ async def chat_endpoint(payload: ChatRequest):
         if not question:
             return ChatResponse(answer="⚠️ Please enter a valid legal question.", source="fallback_llm")
 
-        print(f"[Agent] User question: {question}")
+        log.info("question", extra={"fields": {"chars": len(question)}})
         result = await query_legal_assistant(question)
-        print(f"[Agent] Response Source: {result['source']}")
+        log.info("answered", extra={"fields": {"source": result["source"]}})
         return ChatResponse(answer=result['answer'], source=result['source'])
     except Exception as e:
-        print(f"❌ Error in /chat endpoint: {e}")
+        ERRORS.inc(endpoint="/chat", type=type(e).__name__)
+        log.exception("chat failed", extra={"fields": {"error": type(e).__name__}})
         raise
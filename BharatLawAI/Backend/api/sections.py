@@ -0,0 +1,35 @@
+# backend/api/sections.py
+
+import os
+import sys
+from functools import lru_cache
+from fastapi import APIRouter, HTTPException
+
+# ✅ Access shared ingest modules from the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from ingest.section_index import SectionIndex
+
+router = APIRouter()
+
+SECTIONS_FILE = "data/parsed_acts.jsonl"
+
+@lru_cache(maxsize=1)
+def get_section_index() -> SectionIndex:
+    """Load the (act, section) index once per process; it reloads itself when parsed_acts.jsonl changes."""
+    return SectionIndex(SECTIONS_FILE)
+
+@router.get("/sections/{act}/{section}")
+def get_section(act: str, section: str):
+    """
+    Exact section lookup, e.g. /api/sections/IPC/498A.
+    `act` may be a full title, an abbreviation from ACT_TABLES, or "all".
+    """
+    try:
+        index = get_section_index()
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Section index is not available")
+
+    matches = index.lookup(act, section)
+    if not matches:
+        raise HTTPException(status_code=404, detail=f"Section {section} not found in {act}")
+    return matches[0]
@@ -0,0 +1,102 @@
+# backend/bench/embedder_bench.py
+#
+# Parity and latency of the embedding backends in ingest/embedders.py.
+#
+#   parity   cosine similarity of every ONNX vector to the PyTorch reference;
+#            exits non-zero if the minimum falls below --threshold
+#   latency  one question at a time (batch 1, the query path) and batches
+#            of 32 (ingest and the embedding batcher under load)
+#
+# Run from the Backend directory:  python bench/embedder_bench.py
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.abspath(os.path.join(BACKEND_DIR, "..")))
+import config
+from ingest.embedders import BACKENDS, load_embedder
+
+SAMPLE_QUESTIONS = [
+    "What is the punishment for murder under Section 302 IPC?",
+    "Can the police arrest without a warrant?",
+    "Explain cruelty by husband or relatives under Section 498A.",
+    "What is anticipatory bail?",
+    "Grounds for divorce under the Hindu Marriage Act",
+    "Is a cheque bounce a criminal offence?",
+    "What is the limitation period for filing a civil suit?",
+    "Penalty for driving without a licence under the Motor Vehicles Act",
+]
+
+def load_texts(path, limit):
+    """Section texts from parsed_acts.jsonl when available, else the sample questions"""
+    texts = list(SAMPLE_QUESTIONS)
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                texts.append(json.loads(line).get("text", "")[:2000])
+                if len(texts) >= limit:
+                    break
+    while len(texts) < limit:
+        texts.extend(SAMPLE_QUESTIONS)
+    return texts[:limit]
+
+def latency(embedder, texts, batch_size, runs):
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)][:runs]
+    embedder.encode(batches[0], batch_size=batch_size)  # warm-up
+    times = []
+    for batch in batches:
+        start = time.perf_counter()
+        embedder.encode(batch, batch_size=batch_size)
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1000
+    return np.percentile(times, 50), np.percentile(times, 95), batch_size / (np.mean(times) / 1000)
+
+def main():
+    parser = argparse.ArgumentParser(description="Embedding backend parity and latency")
+    parser.add_argument("--model", default=config.EMBEDDING_MODEL)
+    parser.add_argument("--onnx-dir", default=config.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--texts", default="data/parsed_acts.jsonl")
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--runs", type=int, default=20, help="timed calls per batch size")
+    parser.add_argument("--threshold", type=float, default=0.99, help="minimum cosine to the torch vectors")
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts, args.samples)
+    embedders = {name: load_embedder(name, args.model, onnx_dir=args.onnx_dir) for name in args.backends}
+
+    reference = None
+    if "torch" in embedders:
+        reference = np.asarray(embedders["torch"].encode(texts, batch_size=32), dtype=np.float32)
+        reference /= np.linalg.norm(reference, axis=1, keepdims=True)
+
+    print(f"🧪 {args.model}, {len(texts)} texts")
+    failed = False
+    for name, embedder in embedders.items():
+        p50_1, p95_1, _ = latency(embedder, texts, 1, args.runs)
+        p50_32, p95_32, rate = latency(embedder, texts, 32, args.runs)
+        line = (f"{name:<10} batch 1: p50 {p50_1:7.2f} ms  p95 {p95_1:7.2f} ms   "
+                f"batch 32: p50 {p50_32:8.2f} ms  ({rate:6.0f} texts/s)")
+
+        if reference is not None and name != "torch":
+            vectors = np.asarray(embedder.encode(texts, batch_size=32), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            cosine = (vectors * reference).sum(axis=1)
+            ok = cosine.min() >= args.threshold
+            failed |= not ok
+            line += f"   cosine min {cosine.min():.4f} mean {cosine.mean():.4f} {'✅' if ok else '❌'}"
+        print(line)
+
+    if failed:
+        print(f"❌ Parity below {args.threshold}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# backend/bench/fake_ollama.py
+#
+# A stand-in for the Ollama HTTP API, for load-testing the backend without
+# real generations. It speaks the parts of the API rag/llm_client.py uses:
+#
+#   POST /api/chat       streaming (NDJSON) and non-streaming chat
+#   POST /api/generate   completion; an empty prompt just "loads" the model
+#   GET  /api/tags, /api/version, /
+#   GET  /fake/stats     requests, concurrency and tokens served so far
+#
+# Answers are filler words emitted at --tokens-per-second after a
+# time-to-first-token drawn from --latency (fixed, uniform, exponential or
+# lognormal around --latency-ms). --parallel caps concurrent generations
+# like OLLAMA_NUM_PARALLEL (the rest queue), --cold-load-ms is paid once
+# per model, and --error-rate fails that share of requests with a 500.
+#
+# Run from the Backend directory:
+#   python bench/fake_ollama.py --port 11435 --tokens-per-second 30 --parallel 4
+#   OLLAMA_HOST=http://127.0.0.1:11435 uvicorn main:app
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+WORDS = """
+the accused shall be punished with imprisonment for a term which may extend to
+seven years and shall also be liable to fine under this section the court may
+consider the facts of the case and the provisions of the code before passing
+an order in accordance with law
+""".split()
+
+def created_at() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()) + ".000000Z"
+
+class FakeOllama:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.slots = asyncio.Semaphore(args.parallel) if args.parallel else None
+        self.loaded = set()
+        self.stats = {"requests": 0, "streams": 0, "errors": 0, "active": 0, "queued": 0,
+                      "max_active": 0, "tokens": 0}
+
+    def first_token_delay(self) -> float:
+        mean = self.args.latency_ms / 1000
+        kind = self.args.latency
+        if kind == "uniform":
+            return self.rng.uniform(0, 2 * mean)
+        if kind == "exponential":
+            return self.rng.expovariate(1 / mean) if mean else 0.0
+        if kind == "lognormal":
+            # sigma sets the tail width; scaled so the mean stays at --latency-ms
+            sigma = self.args.latency_sigma
+            return self.rng.lognormvariate(0, sigma) * mean / math.exp(sigma ** 2 / 2)
+        return mean
+
+    def answer_tokens(self) -> list:
+        count = max(1, int(self.rng.gauss(self.args.tokens, self.args.tokens * 0.25)))
+        return [self.rng.choice(WORDS) + " " for _ in range(count)]
+
+    async def generate(self, model: str):
+        """Async iterator of tokens, holding a generation slot for its whole duration"""
+        self.stats["queued"] += 1
+        if self.slots is not None:
+            await self.slots.acquire()
+        self.stats["queued"] -= 1
+        self.stats["active"] += 1
+        self.stats["max_active"] = max(self.stats["max_active"], self.stats["active"])
+        try:
+            if model not in self.loaded:
+                await asyncio.sleep(self.args.cold_load_ms / 1000)
+                self.loaded.add(model)
+            await asyncio.sleep(self.first_token_delay())
+            interval = 1 / self.args.tokens_per_second if self.args.tokens_per_second else 0.0
+            for i, token in enumerate(self.answer_tokens()):
+                if i:
+                    await asyncio.sleep(interval)
+                self.stats["tokens"] += 1
+                yield token
+        finally:
+            self.stats["active"] -= 1
+            if self.slots is not None:
+                self.slots.release()
+
+    def final_fields(self, started: float, count: int) -> dict:
+        total = int((time.perf_counter() - started) * 1e9)
+        return {
+            "done": True, "done_reason": "stop", "total_duration": total, "load_duration": 0,
+            "prompt_eval_count": 0, "prompt_eval_duration": 0, "eval_count": count, "eval_duration": total,
+        }
+
+def create_app(args) -> FastAPI:
+    app = FastAPI()
+    fake = FakeOllama(args)
+
+    async def respond(body: dict, field: str):
+        """Shared /api/chat and /api/generate handling; `field` is "message" or "response"."""
+        model = body.get("model", "")
+        fake.stats["requests"] += 1
+        if fake.rng.random() < args.error_rate:
+            fake.stats["errors"] += 1
+            return JSONResponse(status_code=500, content={"error": "fake ollama: injected failure"})
+
+        def part(text: str) -> dict:
+            content = {"role": "assistant", "content": text} if field == "message" else text
+            return {"model": model, "created_at": created_at(), field: content}
+
+        started = time.perf_counter()
+        if field == "response" and not body.get("prompt"):
+            # Ollama's "load the model" call
+            if model not in fake.loaded:
+                await asyncio.sleep(args.cold_load_ms / 1000)
+                fake.loaded.add(model)
+            return {**part(""), "done": True, "done_reason": "load"}
+
+        if not body.get("stream", True):
+            tokens = [token async for token in fake.generate(model)]
+            return {**part("".join(tokens)), **fake.final_fields(started, len(tokens))}
+
+        fake.stats["streams"] += 1
+
+        async def lines():
+            count = 0
+            async for token in fake.generate(model):
+                count += 1
+                yield json.dumps({**part(token), "done": False}) + "\n"
+            yield json.dumps({**part(""), **fake.final_fields(started, count)}) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        return await respond(await request.json(), "message")
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        return await respond(await request.json(), "response")
+
+    @app.get("/api/tags")
+    async def tags():
+        return {"models": [{"name": name, "model": name} for name in sorted(fake.loaded)]}
+
+    @app.get("/api/version")
+    async def version():
+        return {"version": "0.0.0-fake"}
+
+    @app.get("/fake/stats")
+    async def stats():
+        return fake.stats
+
+    @app.get("/")
+    async def root():
+        return "Ollama is running"
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama-compatible fake LLM server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--tokens-per-second", type=float, default=30.0, help="per generation; 0 = instant")
+    parser.add_argument("--tokens", type=int, default=120, help="mean answer length in tokens")
+    parser.add_argument("--latency", choices=("fixed", "uniform", "exponential", "lognormal"), default="lognormal",
+                        help="distribution of time to first token")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="mean time to first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.6, help="lognormal tail width")
+    parser.add_argument("--parallel", type=int, default=4, help="concurrent generations (0 = unlimited)")
+    parser.add_argument("--cold-load-ms", type=float, default=0.0, help="paid once per model")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"🦙 Fake Ollama on http://{args.host}:{args.port}: {args.tokens} tokens at {args.tokens_per_second}/s, "
+          f"{args.latency} TTFT ~{args.latency_ms:.0f} ms, {args.parallel or 'unlimited'} parallel")
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
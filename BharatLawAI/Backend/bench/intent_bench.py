@@ -0,0 +1,75 @@
+# backend/bench/intent_bench.py
+#
+# Accuracy and speed of rag/intent_classifier.classify_intent against the
+# labelled messages in bench/intent_cases.jsonl, next to the old
+# substring-loop classifier for comparison.
+# Run from the Backend directory:  python bench/intent_bench.py
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+from rag.intent_classifier import INTENTS, classify_intent
+
+CASES_FILE = os.path.join(os.path.dirname(__file__), "intent_cases.jsonl")
+
+def substring_classify_intent(text: str) -> str:
+    """The previous implementation: `keyword in text` over every keyword."""
+    text_lower = text.lower()
+    for intent, keywords in INTENTS.items():
+        if intent == "legal_query":
+            continue
+        for keyword in keywords:
+            if keyword in text_lower:
+                return intent
+    return "legal_query"
+
+def load_cases(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def evaluate(name, classify, cases, repeat):
+    wrong = [(c["text"], c["intent"], classify(c["text"])) for c in cases]
+    wrong = [w for w in wrong if w[1] != w[2]]
+    accuracy = 1 - len(wrong) / len(cases)
+
+    texts = [c["text"] for c in cases]
+    seconds = min(timeit.repeat(lambda: [classify(t) for t in texts], number=repeat, repeat=5))
+    per_call_us = seconds / (repeat * len(texts)) * 1e6
+
+    print(f"{name:<12} accuracy {accuracy:6.1%}   {per_call_us:6.2f} µs/message")
+    for text, expected, got in wrong:
+        print(f"   ✗ {text!r}: expected {expected}, got {got}")
+
+def executor_hop_us(classify, text, calls=2000):
+    """What sending one classification through a thread pool costs, for comparison."""
+    async def run():
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            start = time.perf_counter()
+            for _ in range(calls):
+                await loop.run_in_executor(pool, classify, text)
+            return (time.perf_counter() - start) / calls * 1e6
+    return asyncio.run(run())
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent classifier accuracy and latency")
+    parser.add_argument("--cases", default=CASES_FILE)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = load_cases(args.cases)
+    print(f"🧭 {len(cases)} labelled messages")
+    evaluate("substring", substring_classify_intent, cases, args.repeat)
+    evaluate("regex", classify_intent, cases, args.repeat)
+    print(f"{'(executor)':<12} {executor_hop_us(classify_intent, cases[0]['text']):23.2f} µs/message via run_in_executor")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# backend/bench/load_bench.py
+#
+# Concurrent mixed traffic against a running backend, e.g. one pointed at
+# bench/fake_ollama.py so the LLM is fast and predictable:
+#
+#   greeting  "hi", "thanks" ...              intent classifier, no retrieval
+#   citation  "What does Section 302 IPC say" section index, LLM
+#   open      "Can police arrest without ..." embedding, retrieval, LLM
+#
+# Closed loop by default (--concurrency workers, each sending its next request
+# when the last one finishes); --rate switches to open-loop Poisson arrivals,
+# which keeps measuring honestly once the server falls behind. --stream uses
+# /chat/stream and also records time to the first token.
+#
+# Meanwhile a probe requests the trivial GET / every --probe-ms: if it slows
+# down, something is blocking the event loop. Reports throughput, latency
+# percentiles per traffic type, error rate by status, answer sources, probe
+# lag and the server's /stats (executor and LLM gate saturation).
+#
+# Run from the Backend directory, with the backend and fake Ollama up:
+#   python bench/fake_ollama.py --port 11435 &
+#   OLLAMA_HOST=http://127.0.0.1:11435 uvicorn main:app --port 8000 &
+#   python bench/load_bench.py --concurrency 32 --duration 30
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+import numpy as np
+
+GREETINGS = ["hi", "hello there", "thanks a lot", "good morning", "bye", "thank you so much", "hey"]
+CITATIONS = [
+    "What does Section 302 of IPC say?",
+    "Explain Section 498A IPC",
+    "What is Section 154 of CrPC?",
+    "Section 138 of the Negotiable Instruments Act",
+    "Punishment under Section 420 IPC",
+    "What does Section 13 of the Hindu Marriage Act provide?",
+    "Explain Section 41 CrPC",
+    "Section 185 of the Motor Vehicles Act",
+]
+OPEN_QUESTIONS = [
+    "Can the police arrest someone without a warrant?",
+    "What is the punishment for cheating?",
+    "How do I file for divorce on grounds of cruelty?",
+    "Is dowry demand a criminal offence?",
+    "What happens if a cheque bounces?",
+    "What are my rights if I am detained by the police?",
+    "Can a tenant be evicted without notice?",
+    "What is the penalty for drunk driving?",
+    "How does anticipatory bail work?",
+    "What is defamation under Indian law?",
+]
+TRAFFIC = {"greeting": GREETINGS, "citation": CITATIONS, "open": OPEN_QUESTIONS}
+
+def parse_mix(text):
+    """ "greeting=0.2,citation=0.3,open=0.5" -> {"greeting": 0.2, ...} """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in TRAFFIC:
+            raise argparse.ArgumentTypeError(f"unknown traffic type {name!r} (expected {', '.join(TRAFFIC)})")
+        mix[name.strip()] = float(weight)
+    return mix
+
+def percentiles(values):
+    if not values:
+        return {}
+    ms = np.asarray(values) * 1000
+    return {name: float(np.percentile(ms, q)) for name, q in (("p50", 50), ("p90", 90), ("p95", 95), ("p99", 99))} \
+        | {"max": float(ms.max()), "mean": float(ms.mean())}
+
+class LoadRun:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.kinds, self.weights = zip(*args.mix.items())
+        self.results = []  # dicts: kind, status, seconds, ttft, source, error
+        self.probe = []
+        self.measuring = False
+
+    def next_question(self):
+        kind = self.rng.choices(self.kinds, weights=self.weights)[0]
+        return kind, self.rng.choice(TRAFFIC[kind])
+
+    async def send(self, client, kind, question):
+        start = time.perf_counter()
+        result = {"kind": kind, "status": None, "seconds": None, "ttft": None, "source": None, "error": None}
+        try:
+            if self.args.stream:
+                async with client.stream("POST", "/chat/stream", json={"question": question}) as response:
+                    result["status"] = response.status_code
+                    event = None
+                    async for line in response.aiter_lines():
+                        if line.startswith("event: "):
+                            event = line[7:]
+                        elif line.startswith("data: "):
+                            if event == "token" and result["ttft"] is None:
+                                result["ttft"] = time.perf_counter() - start
+                            elif event in ("meta", "done"):
+                                result["source"] = json.loads(line[6:]).get("source")
+                            elif event == "error":
+                                result["error"] = "stream error event"
+            else:
+                response = await client.post("/chat", json={"question": question})
+                result["status"] = response.status_code
+                if response.status_code == 200:
+                    result["source"] = response.json().get("source")
+        except httpx.HTTPError as e:
+            result["error"] = type(e).__name__
+        result["seconds"] = time.perf_counter() - start
+        if self.measuring:
+            self.results.append(result)
+
+    async def closed_loop(self, client, deadline):
+        async def worker():
+            while time.perf_counter() < deadline:
+                await self.send(client, *self.next_question())
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+
+    async def open_loop(self, client, deadline):
+        tasks = set()
+        while time.perf_counter() < deadline:
+            task = asyncio.create_task(self.send(client, *self.next_question()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            await asyncio.sleep(self.rng.expovariate(self.args.rate))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def probe_loop(self, client, stop):
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                await client.get("/")
+                if self.measuring:
+                    self.probe.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(self.args.probe_ms / 1000)
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        timeout = httpx.Timeout(self.args.timeout)
+        async with httpx.AsyncClient(base_url=self.args.url, limits=limits, timeout=timeout) as client, \
+                   httpx.AsyncClient(base_url=self.args.url, timeout=timeout) as probe_client:
+            stop = asyncio.Event()
+            probe = asyncio.create_task(self.probe_loop(probe_client, stop))
+            drive = self.open_loop if self.args.rate else self.closed_loop
+
+            if self.args.warmup:
+                await drive(client, time.perf_counter() + self.args.warmup)
+            self.measuring = True
+            start = time.perf_counter()
+            await drive(client, start + self.args.duration)
+            elapsed = time.perf_counter() - start
+            self.measuring = False
+
+            stop.set()
+            await probe
+            try:
+                server_stats = (await client.get("/stats")).json()
+            except (httpx.HTTPError, ValueError):
+                server_stats = None
+        return elapsed, server_stats
+
+    def report(self, elapsed, server_stats):
+        ok = [r for r in self.results if r["status"] == 200 and not r["error"]]
+        statuses = {}
+        for r in self.results:
+            key = str(r["status"]) if r["status"] is not None else r["error"]
+            if r["status"] == 200 and r["error"]:
+                key = "200+" + r["error"]
+            statuses[key] = statuses.get(key, 0) + 1
+        sources = {}
+        for r in ok:
+            sources[r["source"]] = sources.get(r["source"], 0) + 1
+
+        summary = {
+            "config": {k: v for k, v in vars(self.args).items() if k != "json"},
+            "seconds": elapsed,
+            "requests": len(self.results),
+            "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+            "error_rate": 1 - len(ok) / len(self.results) if self.results else 0.0,
+            "statuses": statuses,
+            "sources": sources,
+            "latency_ms": percentiles([r["seconds"] for r in ok]),
+            "by_type": {},
+            "probe_ms": percentiles(self.probe),
+            "server_stats": server_stats,
+        }
+        if self.args.stream:
+            summary["ttft_ms"] = percentiles([r["ttft"] for r in ok if r["ttft"] is not None])
+        for kind in self.kinds:
+            done = [r for r in ok if r["kind"] == kind]
+            summary["by_type"][kind] = {"requests": len(done), "latency_ms": percentiles([r["seconds"] for r in done])}
+
+        mode = f"rate {self.args.rate}/s" if self.args.rate else f"concurrency {self.args.concurrency}"
+        print(f"🚚 {len(self.results)} requests in {elapsed:.1f}s ({mode}{', streaming' if self.args.stream else ''})")
+        print(f"   throughput {summary['throughput_rps']:.1f} req/s   errors {summary['error_rate']:.1%}   "
+              f"statuses {statuses}")
+        print(f"   sources {sources}")
+
+        def line(name, values):
+            if values:
+                print(f"   {name:<10} p50 {values['p50']:8.1f}  p95 {values['p95']:8.1f}  "
+                      f"p99 {values['p99']:8.1f}  max {values['max']:8.1f} ms")
+        line("all", summary["latency_ms"])
+        for kind, values in summary["by_type"].items():
+            line(kind, values["latency_ms"])
+        if self.args.stream:
+            line("ttft", summary["ttft_ms"])
+        line("probe", summary["probe_ms"])
+        if summary["probe_ms"] and summary["probe_ms"]["p99"] > 50:
+            print("   ⚠️ GET / p99 above 50 ms: the event loop is being blocked")
+        if server_stats:
+            print(f"   server /stats: {json.dumps(server_stats)}")
+        return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent mixed-traffic load test for /chat")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=16, help="closed-loop workers")
+    parser.add_argument("--rate", type=float, default=0.0, help="open-loop arrivals per second (overrides --concurrency)")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds first")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("greeting=0.2,citation=0.3,open=0.5"))
+    parser.add_argument("--stream", action="store_true", help="use /chat/stream and record time to first token")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--probe-ms", type=float, default=100.0, help="event-loop probe interval")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the summary to this file")
+    args = parser.parse_args()
+
+    run = LoadRun(args)
+    summary = run.report(*asyncio.run(run.run()))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        print(f"💾 Results → {args.json}")
+
+if __name__ == "__main__":
+    main()
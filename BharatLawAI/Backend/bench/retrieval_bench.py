@@ -0,0 +1,474 @@
+# backend/bench/retrieval_bench.py
+#
+# Offline retrieval benchmark: no network, no Ollama, no existing index.
+#
+#   corpus    synthetic statutes in the parsed_acts.jsonl format (clauses,
+#             explanations, lengths from a few lines to several chunks), or
+#             a seeded sample of a real parsed_acts.jsonl with --corpus
+#   queries   labelled with the (act, section) that answers them:
+#               citation    "What does Section 302 of the Indian Penal Code say?"
+#               paraphrase  the section's content words in a question, some
+#                           swapped for unrelated words
+#             or a labelled JSONL of your own with --queries
+#   embedder  "hash" (default) is a feature-hashing bag of words that needs
+#             no model; torch / onnx / onnx-int8 use ingest/embedders.py with
+#             whatever model is available locally
+#
+# For each retriever configuration (BM25, the NumPy store in float32 /
+# float16 / int8 / binary, BM25 + NumPy fused by reciprocal rank, and
+# Chroma when chromadb is installed) it reports search latency
+# p50/p95/p99, recall@k and MRR, overall and per query type, plus
+# embedding throughput. --json writes everything for regression tracking;
+# --compare checks a run against an earlier --json file and exits 1 on a
+# recall drop or latency rise beyond the tolerances.
+#
+# Run from the Backend directory:
+#   python bench/retrieval_bench.py --sections 3000 --json bench/retrieval.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.abspath(os.path.join(BACKEND_DIR, "..")))
+import config
+from rag.fusion import reciprocal_rank_fusion
+from ingest.bm25_index import BM25Index, build_bm25_index
+from ingest.chunking import Chunker, iter_chunks
+from ingest.embedders import BACKENDS, load_embedder
+from ingest.vector_store import NumpyVectorStore, export_collection
+
+RESULT_VERSION = 1
+RECALL_AT = (1, 5, 10)
+CONFIGS = ("bm25", "numpy-f32", "numpy-f16", "numpy-int8", "numpy-binary", "hybrid", "chroma")
+
+# Synthetic acts: (name, share of sections)
+ACTS = [
+    ("Indian Penal Code, 1860", 0.25),
+    ("Code of Criminal Procedure, 1973", 0.2),
+    ("Motor Vehicles Act, 1988", 0.12),
+    ("Negotiable Instruments Act, 1881", 0.08),
+    ("Hindu Marriage Act, 1955", 0.05),
+    ("Companies Act, 2013", 0.2),
+    ("Consumer Protection Act, 2019", 0.1),
+]
+
+# Statute boilerplate shared by every section; topic words are generated per corpus
+LEGAL_WORDS = """
+whoever shall person court punished imprisonment term extend years fine offence
+liable provided notwithstanding government notification application order
+magistrate officer authority prescribed manner section clause sub-section act
+rules made under this such any other than being deemed contained thereof
+competent jurisdiction proceedings apply purpose respect case either description
+""".split()
+QUESTION_TEMPLATES = [
+    "what does the law say about {}",
+    "which provision deals with {}",
+    "explain the rules on {}",
+    "is there a penalty for {}",
+    "{} under indian law",
+]
+CITATION_TEMPLATES = [
+    "What does {section} of the {act} say?",
+    "Explain section {number} of {short}",
+    "{short} section {number}",
+    "What is the punishment under section {number} {short}?",
+]
+
+# ── Corpus and labelled queries ──────────────────────────────────────────────
+
+def pseudo_words(rng, count):
+    """Distinct pronounceable non-words, so topics never collide with boilerplate"""
+    onsets, vowels, codas = "b c d f g k l m n p r s t v z br tr pl st gr".split(), "a e i o u ai ia".split(), "n r s l t x nd".split()
+    words = set()
+    while len(words) < count:
+        word = "".join(rng.choice(onsets) + rng.choice(vowels) for _ in range(rng.randint(2, 3))) + rng.choice(codas)
+        if word not in LEGAL_WORDS:
+            words.add(word)
+    return sorted(words)
+
+def synthetic_corpus(path, sections, seed):
+    """Write `sections` synthetic records; returns them"""
+    rng = random.Random(seed)
+    vocab = pseudo_words(rng, max(2000, sections * 3))
+    # Zipf-like topic word frequencies, as in real statutes
+    weights = [1 / (rank + 10) for rank in range(len(vocab))]
+
+    def sentence(topic, length):
+        words = [rng.choice(topic) if rng.random() < 0.3 else rng.choice(LEGAL_WORDS) for _ in range(length)]
+        words[0] = words[0].capitalize()
+        return " ".join(words)
+
+    records = []
+    for act, share in ACTS:
+        for number in range(1, max(1, int(sections * share)) + 1):
+            topic = rng.choices(vocab, weights=weights, k=8)
+            heading = " ".join(rng.sample(topic, 3)).capitalize()
+            # Log-normal length: most sections are short, a few run to several chunks
+            clauses = max(1, int(rng.lognormvariate(1.2, 0.9)))
+            parts = []
+            for i in range(clauses):
+                body = sentence(topic, rng.randint(12, 60))
+                if clauses > 1:
+                    body = f"({i + 1}) {body}"
+                if rng.random() < 0.3:
+                    body += "; " + "; ".join(f"({chr(97 + j)}) {sentence(topic, rng.randint(6, 20))}" for j in range(rng.randint(2, 4)))
+                parts.append(body + ".")
+            if rng.random() < 0.2:
+                parts.append(f"Explanation.—{sentence(topic, rng.randint(10, 30))}.")
+            suffix = rng.choice(["", "", "", "A", "B"])
+            records.append({
+                "act": act,
+                "section_no": f"Section {number}{suffix}.",
+                "heading": heading,
+                "text": " ".join(parts),
+                "topic": topic,
+            })
+
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({k: v for k, v in record.items() if k != "topic"}, ensure_ascii=False) + "\n")
+    return records
+
+def sampled_corpus(source, path, sections, seed):
+    """Seeded reservoir sample of a real parsed_acts.jsonl"""
+    rng = random.Random(seed)
+    sample = []
+    with open(source, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if len(sample) < sections:
+                sample.append(line)
+            elif (j := rng.randint(0, i)) < sections:
+                sample[j] = line
+    records = [json.loads(line) for line in sample]
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(line if line.endswith("\n") else line + "\n" for line in sample)
+    return records
+
+def short_act(act):
+    """ "Indian Penal Code, 1860" -> "Indian Penal Code" (the year is rarely typed) """
+    return act.split(",")[0]
+
+def make_queries(records, count, seed):
+    """Half citation, half paraphrase queries, each labelled with its section"""
+    rng = random.Random(seed)
+    targets = rng.sample(records, min(count, len(records)))
+    stop = set(LEGAL_WORDS)
+    queries = []
+    for i, record in enumerate(targets):
+        label = {"act": record["act"], "section_no": record["section_no"]}
+        if i % 2 == 0:
+            number = re.sub(r"^Section\s*|\.$", "", record["section_no"])
+            template = rng.choice(CITATION_TEMPLATES)
+            query = template.format(section=record["section_no"].rstrip("."), number=number,
+                                    act=record["act"], short=short_act(record["act"]))
+            queries.append({"query": query, "type": "citation", **label})
+        else:
+            # Content words from the section, never its heading verbatim, with a quarter swapped out
+            text = f"{record.get('heading', '')} {record.get('text', '')}".lower()
+            words = record.get("topic") or list(dict.fromkeys(w for w in re.findall(r"[a-z]{3,}", text) if w not in stop))
+            if not words:
+                continue
+            picked = rng.sample(words, min(4, len(words)))
+            picked = [rng.choice(LEGAL_WORDS) if rng.random() < 0.25 else w for w in picked]
+            query = rng.choice(QUESTION_TEMPLATES).format(" ".join(picked))
+            queries.append({"query": query, "type": "paraphrase", **label})
+    return queries
+
+# ── Offline embedder ─────────────────────────────────────────────────────────
+
+class HashEmbedder:
+    """
+    Signed feature hashing of word unigrams and bigrams, L2-normalised.
+    Deterministic (crc32, not Python's salted hash) and model-free, so the
+    dense retrievers can be exercised with no network; the numbers measure
+    the retrieval machinery, not semantic quality.
+    """
+
+    backend = "hash"
+    model_name = "hash"
+    max_seq_length = 512
+    tokenizer = None
+
+    def __init__(self, dimension=384):
+        self.dimension = dimension
+        self._features = {}
+
+    def _feature(self, token):
+        feature = self._features.get(token)
+        if feature is None:
+            h = zlib.crc32(token.encode("utf-8"))
+            feature = self._features[token] = (h % self.dimension, 1.0 if h & 0x80000000 else -1.0)
+        return feature
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        out = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"\w+", text.lower())
+            for token in words + [a + " " + b for a, b in zip(words, words[1:])]:
+                column, sign = self._feature(token)
+                out[row, column] += sign
+        out /= np.linalg.norm(out, axis=1, keepdims=True).clip(1e-12)
+        return out[0] if single else out
+
+class ArrayCollection:
+    """The read side of a Chroma collection over in-memory arrays, for `export_collection`"""
+
+    metadata = {"hnsw:space": "l2"}
+
+    def __init__(self, ids, documents, metadatas, embeddings):
+        self.ids, self.documents, self.metadatas, self.embeddings = ids, documents, metadatas, embeddings
+
+    def count(self):
+        return len(self.ids)
+
+    def get(self, limit, offset, include):
+        end = offset + limit
+        return {
+            "ids": self.ids[offset:end],
+            "documents": self.documents[offset:end],
+            "metadatas": self.metadatas[offset:end],
+            "embeddings": self.embeddings[offset:end],
+        }
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+def summarize(latencies, ranked_sections, queries):
+    """Latency percentiles plus recall@k / MRR, overall and per query type"""
+    def quality(indexes):
+        result = {}
+        for k in RECALL_AT:
+            result[f"recall@{k}"] = float(np.mean([
+                (queries[i]["act"], queries[i]["section_no"]) in ranked_sections[i][:k] for i in indexes
+            ])) if indexes else 0.0
+        reciprocal = []
+        for i in indexes:
+            label = (queries[i]["act"], queries[i]["section_no"])
+            ranking = ranked_sections[i][:max(RECALL_AT)]
+            reciprocal.append(1 / (ranking.index(label) + 1) if label in ranking else 0.0)
+        result[f"mrr@{max(RECALL_AT)}"] = float(np.mean(reciprocal)) if reciprocal else 0.0
+        return result
+
+    ms = np.asarray(latencies) * 1000
+    summary = {
+        "latency_ms": {
+            "p50": float(np.percentile(ms, 50)), "p95": float(np.percentile(ms, 95)),
+            "p99": float(np.percentile(ms, 99)), "mean": float(ms.mean()),
+        },
+        "qps": float(len(ms) / (ms.sum() / 1000)) if ms.sum() else 0.0,
+        **quality(list(range(len(queries)))),
+        "by_type": {},
+    }
+    for kind in sorted({q["type"] for q in queries}):
+        summary["by_type"][kind] = quality([i for i, q in enumerate(queries) if q["type"] == kind])
+    return summary
+
+def run_config(search, queries, query_vectors, section_of, k):
+    """Time `search(query, vector, k) -> [chunk ids]` per query; rankings are deduplicated by section"""
+    search(queries[0]["query"], query_vectors[0], k)  # warm-up
+    latencies, ranked = [], []
+    for query, vector in zip(queries, query_vectors):
+        start = time.perf_counter()
+        ids = search(query["query"], vector, k)
+        latencies.append(time.perf_counter() - start)
+        sections = []
+        for uid in ids:
+            section = section_of.get(uid)
+            if section not in sections:
+                sections.append(section)
+        ranked.append(sections)
+    return summarize(latencies, ranked, queries)
+
+def compare(results, baseline_path, max_recall_drop, max_latency_increase):
+    """Regressions of this run against an earlier --json file"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    problems = []
+    for name, current in results["configs"].items():
+        before = baseline.get("configs", {}).get(name)
+        if not before:
+            continue
+        for key in [f"recall@{k}" for k in RECALL_AT] + [f"mrr@{max(RECALL_AT)}"]:
+            if current[key] < before[key] - max_recall_drop:
+                problems.append(f"{name} {key} {before[key]:.3f} → {current[key]:.3f}")
+        p95, old_p95 = current["latency_ms"]["p95"], before["latency_ms"]["p95"]
+        if old_p95 and p95 > old_p95 * (1 + max_latency_increase):
+            problems.append(f"{name} p95 {old_p95:.2f} ms → {p95:.2f} ms")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval latency and recall benchmark")
+    parser.add_argument("--corpus", help="sample sections from this parsed_acts.jsonl instead of synthesizing")
+    parser.add_argument("--sections", type=int, default=2000, help="sections to synthesize or sample")
+    parser.add_argument("--queries", help="labelled queries JSONL: query, act, section_no, type")
+    parser.add_argument("--num-queries", type=int, default=400)
+    parser.add_argument("--embedder", choices=("hash",) + BACKENDS, default="hash")
+    parser.add_argument("--model", default=config.EMBEDDING_MODEL)
+    parser.add_argument("--configs", nargs="+", choices=CONFIGS, default=list(CONFIGS))
+    parser.add_argument("-k", type=int, default=max(RECALL_AT), help="chunks retrieved per query")
+    parser.add_argument("--rescore", type=int, default=config.VECTOR_RESCORE_CANDIDATES)
+    parser.add_argument("--chunk-tokens", type=int, default=0, help="0 = the embedder's max sequence length")
+    parser.add_argument("--seed", type=int, default=13)
+    parser.add_argument("--workdir", help="keep corpus, queries and indexes here (default: a temp dir)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json results; exit 1 on regression")
+    parser.add_argument("--max-recall-drop", type=float, default=0.02)
+    parser.add_argument("--max-latency-increase", type=float, default=0.5, help="allowed relative p95 rise")
+    args = parser.parse_args()
+
+    temp = None
+    if args.workdir:
+        os.makedirs(args.workdir, exist_ok=True)
+        workdir = args.workdir
+    else:
+        temp = tempfile.TemporaryDirectory()
+        workdir = temp.name
+    corpus_path = os.path.join(workdir, "parsed_acts.jsonl")
+
+    # 📚 Corpus and labelled queries
+    if args.corpus:
+        records = sampled_corpus(args.corpus, corpus_path, args.sections, args.seed)
+    else:
+        records = synthetic_corpus(corpus_path, args.sections, args.seed)
+    if args.queries:
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [json.loads(line) for line in f if line.strip()]
+    else:
+        queries = make_queries(records, args.num_queries, args.seed)
+    with open(os.path.join(workdir, "queries.jsonl"), "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(q, ensure_ascii=False) + "\n" for q in queries)
+
+    embedder = HashEmbedder() if args.embedder == "hash" else load_embedder(args.embedder, args.model)
+    chunker = Chunker.for_embedder(embedder, args.chunk_tokens)
+    chunks = list(iter_chunks(corpus_path, chunker))
+    ids, documents, metadatas = (list(column) for column in zip(*chunks))
+    section_of = {uid: (meta["act"], meta["section_no"]) for uid, _, meta in chunks}
+    print(f"📚 {len(records)} sections → {len(chunks)} chunks, {len(queries)} queries "
+          f"({', '.join(sorted({q['type'] for q in queries}))}), embedder {args.embedder}")
+
+    # 🧠 Embedding throughput: corpus in batches of 32, queries one at a time
+    start = time.perf_counter()
+    vectors = np.asarray(embedder.encode(documents, batch_size=32), dtype=np.float32)
+    corpus_seconds = time.perf_counter() - start
+    query_vectors, query_latency = [], []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(np.asarray(embedder.encode(query["query"]), dtype=np.float32))
+        query_latency.append(time.perf_counter() - start)
+    query_ms = np.asarray(query_latency) * 1000
+    embedding = {
+        "backend": args.embedder,
+        "model": getattr(embedder, "model_name", args.model),
+        "dimension": int(vectors.shape[1]),
+        "chunks_per_s": len(documents) / corpus_seconds,
+        "query_ms": {"p50": float(np.percentile(query_ms, 50)), "p95": float(np.percentile(query_ms, 95))},
+    }
+    print(f"🧠 corpus {embedding['chunks_per_s']:.0f} chunks/s, query p50 {embedding['query_ms']['p50']:.2f} ms "
+          f"p95 {embedding['query_ms']['p95']:.2f} ms")
+
+    # 🔎 Retriever configurations
+    searches = {}
+    wanted = set(args.configs)
+    if wanted & {"bm25", "hybrid"}:
+        build_bm25_index(corpus_path, chunker=chunker)
+        bm25 = BM25Index(corpus_path)
+        def bm25_search(query, vector, k):
+            return [ids[doc] for doc, _, _ in bm25.search(query, k)]
+        searches["bm25"] = bm25_search
+
+    collection = ArrayCollection(ids, documents, metadatas, vectors)
+    stores = {
+        "numpy-f32": dict(dtype="float32"),
+        "numpy-f16": dict(dtype="float16"),
+        "numpy-int8": dict(dtype="float32", quantization="int8"),
+        "numpy-binary": dict(dtype="float32", quantization="binary"),
+    }
+    for name, options in stores.items():
+        if name in wanted or (name == "numpy-f32" and "hybrid" in wanted):
+            store = NumpyVectorStore(export_collection(collection, os.path.join(workdir, name), **options),
+                                     rescore=args.rescore)
+            searches[name] = lambda query, vector, k, store=store: [store.ids[row] for row, _ in store.search(vector, k)]
+
+    if "hybrid" in wanted:
+        # Sequential here; the backend runs both retrievers in parallel
+        def hybrid_search(query, vector, k):
+            rankings = [searches["numpy-f32"](query, vector, k), searches["bm25"](query, vector, k)]
+            return [uid for uid, _ in reciprocal_rank_fusion(rankings, k=config.RRF_K, limit=k)]
+        searches["hybrid"] = hybrid_search
+
+    if "chroma" in wanted:
+        try:
+            import chromadb
+        except ImportError:
+            print("⚠️ chromadb not installed, skipping the chroma configuration")
+        else:
+            client = chromadb.PersistentClient(path=os.path.join(workdir, "chroma"))
+            chroma = client.get_or_create_collection("bench")
+            for offset in range(0, len(ids), 1000):
+                chroma.upsert(ids=ids[offset:offset + 1000], documents=documents[offset:offset + 1000],
+                              metadatas=metadatas[offset:offset + 1000],
+                              embeddings=vectors[offset:offset + 1000].tolist())
+            def chroma_search(query, vector, k):
+                return chroma.query(query_embeddings=[vector.tolist()], n_results=k, include=[])["ids"][0]
+            searches["chroma"] = chroma_search
+
+    results = {
+        "version": RESULT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": {
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "cpus": os.cpu_count(),
+        },
+        "corpus": {
+            "source": args.corpus or "synthetic", "seed": args.seed, "sections": len(records),
+            "chunks": len(chunks), "queries": len(queries), "chunker": chunker.spec(),
+        },
+        "embedding": embedding,
+        "configs": {},
+    }
+
+    print(f"\n{'config':<14}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'qps':>9}"
+          + "".join(f"{'R@' + str(k):>7}" for k in RECALL_AT) + f"{'MRR':>7}   by type (R@{RECALL_AT[1]})")
+    for name in CONFIGS:
+        if name not in wanted or name not in searches:
+            continue
+        summary = run_config(searches[name], queries, query_vectors, section_of, args.k)
+        results["configs"][name] = summary
+        latency = summary["latency_ms"]
+        by_type = "  ".join(f"{kind} {values[f'recall@{RECALL_AT[1]}']:.2f}" for kind, values in summary["by_type"].items())
+        print(f"{name:<14}{latency['p50']:9.3f}{latency['p95']:9.3f}{latency['p99']:9.3f}{summary['qps']:9.0f}"
+              + "".join(f"{summary[f'recall@{k}']:7.3f}" for k in RECALL_AT)
+              + f"{summary[f'mrr@{max(RECALL_AT)}']:7.3f}   {by_type}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results → {args.json}")
+
+    if "bm25" in searches:
+        bm25.close()
+    if temp is not None:
+        temp.cleanup()
+
+    if args.compare:
+        problems = compare(results, args.compare, args.max_recall_drop, args.max_latency_increase)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"✅ No regressions against {args.compare}")
+
+if __name__ == "__main__":
+    main()
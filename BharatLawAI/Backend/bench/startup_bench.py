@@ -0,0 +1,73 @@
+# backend/bench/startup_bench.py
+#
+# Measures cold-start cost of the API:
+#   * import time of `main` (should stay small now that models load lazily)
+#   * time until every resource is loaded and /ready would answer 200
+#
+# Each run is a fresh subprocess so nothing is shared between measurements.
+# Run from the Backend directory:  python bench/startup_bench.py --runs 5
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+PROBE = r"""
+import asyncio, json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter() - start
+
+from rag.resources import resources
+from rag.executors import retrieval_executor
+
+async def preload():
+    resources.start_preload(retrieval_executor)
+    await resources.wait_ready()
+
+ready = None
+if %(ready)s:
+    asyncio.run(preload())
+    ready = time.perf_counter() - start if resources.ready else None
+print(json.dumps({"import": imported, "ready": ready, "status": resources.status()}))
+"""
+
+def run_once(measure_ready: bool) -> dict:
+    env = dict(os.environ, PRELOAD_RESOURCES="0", LLM_WARMUP="0")
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % {"ready": measure_ready}],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    # Loader progress is printed too; the measurement is the last line
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def summarize(label: str, values: list):
+    values = [v for v in values if v is not None]
+    if not values:
+        print(f"{label:<22} n/a")
+        return
+    print(f"{label:<22} median {statistics.median(values) * 1000:8.1f} ms"
+          f"   min {min(values) * 1000:8.1f} ms   max {max(values) * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the FastAPI backend")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-only", action="store_true", help="skip loading models and Chroma")
+    args = parser.parse_args()
+
+    runs = [run_once(not args.import_only) for _ in range(args.runs)]
+
+    print(f"⏱️ Startup over {args.runs} fresh processes")
+    summarize("import main", [r["import"] for r in runs])
+    if not args.import_only:
+        summarize("ready (all loaded)", [r["ready"] for r in runs])
+        for name, res in runs[-1]["status"]["resources"].items():
+            detail = f"{res['load_seconds']:.2f}s" if res["loaded"] else f"failed: {res['error']}"
+            print(f"   {name:<19} {detail}")
+
+if __name__ == "__main__":
+    main()
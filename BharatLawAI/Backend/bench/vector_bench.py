@@ -0,0 +1,106 @@
+# backend/bench/vector_bench.py
+#
+# Dense retrieval backends side by side: Chroma (HNSW) against the exact
+# NumPy store in float32 and float16, and the int8 / binary quantized
+# stores with and without float re-scoring. Reports per-query latency,
+# vector memory a query scans and recall@k against exact float32 search.
+#
+# Queries are stored vectors with a little Gaussian noise, so no model is
+# needed; pass --questions to encode real questions with the embedder instead.
+# Run from the Backend directory:  python bench/vector_bench.py --queries 200
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.abspath(os.path.join(BACKEND_DIR, "..")))
+import config
+from ingest.vector_store import NumpyVectorStore, export_collection
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000
+
+def timed(search, queries):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(search(query))
+        latencies.append(time.perf_counter() - start)
+    return latencies, results
+
+def recall(results, truth):
+    return statistics.mean(len(set(r) & set(t)) / len(t) for r, t in zip(results, truth) if t)
+
+def report(name, latencies, results, truth):
+    print(f"{name:<17} p50 {percentile(latencies, 50):7.2f} ms   p95 {percentile(latencies, 95):7.2f} ms"
+          f"   recall@k {recall(results, truth):.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma vs NumPy vector search")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--rescore", type=int, default=config.VECTOR_RESCORE_CANDIDATES,
+                        help="candidates re-scored in float32 for quantized stores")
+    parser.add_argument("--questions", help="text file, one question per line, encoded with the embedder")
+    parser.add_argument("--no-chroma", action="store_true", help="compare NumPy precisions only")
+    args = parser.parse_args()
+
+    from chromadb import PersistentClient
+    collection = PersistentClient(path=config.CHROMA_PATH).get_collection(config.CHROMA_COLLECTION)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def export(name, **kwargs):
+            return export_collection(collection, os.path.join(tmp, name), **kwargs)
+
+        exact = NumpyVectorStore(export("float32", dtype="float32"))
+        float16 = export("float16", dtype="float16")
+        int8 = export("int8", dtype="float32", quantization="int8")
+        binary = export("binary", dtype="float32", quantization="binary")
+        stores = {
+            "numpy float32": exact,
+            "numpy float16": NumpyVectorStore(float16),
+            "int8 + rescore": NumpyVectorStore(int8, rescore=args.rescore),
+            "int8 only": NumpyVectorStore(int8, rescore=args.k),
+            "binary + rescore": NumpyVectorStore(binary, rescore=args.rescore),
+            "binary only": NumpyVectorStore(binary, rescore=args.k),
+        }
+        print(f"🧮 {len(exact)} vectors, dim {exact.embeddings.shape[1]}, k={args.k}, rescore={args.rescore}")
+
+        if args.questions:
+            from sentence_transformers import SentenceTransformer
+            with open(args.questions, "r", encoding="utf-8") as f:
+                questions = [line.strip() for line in f if line.strip()]
+            queries = SentenceTransformer(config.EMBEDDING_MODEL).encode(questions)
+        else:
+            rng = np.random.default_rng(0)
+            rows = rng.choice(len(exact), size=min(args.queries, len(exact)), replace=False)
+            base = np.asarray(exact.embeddings[np.sort(rows)], dtype=np.float32)
+            queries = base + rng.normal(scale=args.noise, size=base.shape).astype(np.float32)
+
+        _, truth = timed(lambda q: [row for row, _ in exact.search(q, args.k)], queries)
+        truth = [[exact.ids[row] for row in rows] for rows in truth]
+
+        baseline = exact.resident_bytes()
+        for name, store in stores.items():
+            latencies, results = timed(lambda q: [store.ids[row] for row, _ in store.search(q, args.k)], queries)
+            report(name, latencies, results, truth)
+            size = store.resident_bytes()
+            print(f"{'':<16} vectors {size / 2**20:.1f} MiB ({1 - size / baseline:.0%} saved)")
+
+        if not args.no_chroma:
+            latencies, results = timed(
+                lambda q: collection.query(query_embeddings=[q.tolist()], n_results=args.k, include=[])["ids"][0],
+                queries
+            )
+            report("chroma (hnsw)", latencies, results, truth)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# backend/config.py
+# Runtime settings, overridable through environment variables.
+
+import json
+import os
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "1" if default else "0").strip().lower() in ("1", "true", "yes", "on")
+
+# 📦 Shared models and stores (see rag/resources.py)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch", "onnx" or "onnx-int8"
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", "") or None  # default ./models/<model>-onnx
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))  # ONNX Runtime intra-op threads, 0 = auto
+CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
+CHROMA_COLLECTION = os.getenv("CHROMA_COLLECTION", "legal_assistant")
+PRELOAD_RESOURCES = _env_bool("PRELOAD_RESOURCES", True)  # load in the background at startup
+
+# 🔎 Retrieval: "hybrid" (Chroma + BM25 fused by reciprocal rank), "dense" or "lexical"
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")  # "chroma" (HNSW) or "numpy" (exact, mmap)
+NUMPY_STORE_PATH = os.getenv("NUMPY_STORE_PATH", "./chroma_db/legal_assistant.npstore")
+NUMPY_STORE_DTYPE = os.getenv("NUMPY_STORE_DTYPE", "float32")  # used when exporting on first load
+NUMPY_STORE_QUANTIZATION = os.getenv("NUMPY_STORE_QUANTIZATION", "") or None  # "int8" / "binary" on export
+VECTOR_QUANTIZED = _env_bool("VECTOR_QUANTIZED", True)  # first pass on int8/binary codes when the store has them
+VECTOR_RESCORE_CANDIDATES = int(os.getenv("VECTOR_RESCORE_CANDIDATES", "100"))  # re-scored in float32
+BM25_SOURCE = os.getenv("BM25_SOURCE", "data/parsed_acts.jsonl")  # index lives next to it
+BM25_MIN_SCORE = float(os.getenv("BM25_MIN_SCORE", "0.5"))  # normalised 0..1, grounds an answer
+# Must match rag/embed_store.py's --chunk-tokens / --chunk-overlap, so BM25 chunk IDs match Chroma's
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "0"))  # 0 = the embedder's max sequence length
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "32"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+# 🧭 Intent detection: keyword matcher always, query-embedding centroids optionally
+INTENT_EMBEDDING_ENABLED = _env_bool("INTENT_EMBEDDING_ENABLED", False)
+INTENT_EMBEDDING_THRESHOLD = float(os.getenv("INTENT_EMBEDDING_THRESHOLD", "0.8"))
+
+# 💾 Answer cache in front of query_legal_assistant
+ANSWER_CACHE_ENABLED = _env_bool("ANSWER_CACHE_ENABLED", True)
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024"))
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", str(24 * 3600)))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))
+ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", "data/answer_cache.json")  # "" = memory only
+
+# 📦 Cross-request query embedding batches
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "32"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+
+# 🧵 Stage executors and LLM admission control
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "2"))
+RETRIEVAL_WORKERS = int(os.getenv("RETRIEVAL_WORKERS", "4"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "16"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "30"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "180"))
+
+# 🦙 Ollama models and client
+OLLAMA_HOST = os.getenv("OLLAMA_HOST") or None
+LLM_MODEL = os.getenv("LLM_MODEL", "llama3")                                    # grounded answers
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "llama3:8b-instruct-q4_K_M")  # no-context answers
+LLM_OPTIONS = json.loads(os.getenv("LLM_OPTIONS", "{}"))                         # e.g. {"temperature": 0.2}
+# Prompt context per model, in (estimated) tokens; keep it under the model's num_ctx
+# minus room for the question and the answer (Ollama's default num_ctx is 2048)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+CONTEXT_TOKEN_BUDGETS = json.loads(os.getenv("CONTEXT_TOKEN_BUDGETS", "{}"))       # e.g. {"llama3": 5000}
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", str(2 * LLM_MAX_CONCURRENCY)))
+LLM_WARMUP = _env_bool("LLM_WARMUP", True)
+
+# 📊 Observability: /metrics (Prometheus), structured logs, Server-Timing
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" or "json" (one object per line)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_QUESTIONS = _env_bool("LOG_QUESTIONS", True)  # include question text in logs
+SERVER_TIMING = _env_bool("SERVER_TIMING", False)  # per-request stage timings header for the frontend
@@ -1,12 +1,50 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import time
 import uvicorn
 
-from rag.query_engine import query_legal_assistant
+from rag.query_engine import query_legal_assistant, stream_legal_assistant, answer_cache, embedding_batcher
+from rag.executors import Overloaded, llm_gate, executor_stats, retrieval_executor
+from rag.llm_client import llm_client
+from rag.resources import resources
+from rag.metrics import registry, Gauge, ERRORS, RequestContextMiddleware, request_timings
+from rag.logs import get_logger
+import config
 from api.acts import router as acts_router  # <-- your optimized engine
+from api.sections import router as sections_router
 
-app = FastAPI()
+log = get_logger("api")
+
+# ♻️ Process lifetime: load heavy singletons once, release them on shutdown
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models, Chroma and the section index load in the background so the
+    # server starts accepting connections immediately; /ready reports progress
+    if config.PRELOAD_RESOURCES:
+        resources.start_preload(retrieval_executor)
+
+    # 🔥 Load the LLMs in the background so the first chat doesn't pay for a cold model
+    warmup = None
+    if config.LLM_WARMUP:
+        warmup = asyncio.create_task(llm_client.warmup([config.LLM_MODEL, config.LLM_FALLBACK_MODEL]))
+
+    yield
+
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    # 💾 Keep the answer cache warm across restarts
+    if answer_cache is not None:
+        answer_cache.save()
+    await embedding_batcher.close()
+    await llm_client.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # ✅ Allow frontend to talk to backend (localhost + deployed)
 app.add_middleware(
@@ -15,8 +53,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count", "X-Next-Cursor", "X-Request-ID", "Server-Timing"],
 )
 
+# 🗜️ Compress large responses such as /api/acts
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# 🪪 Outermost: request IDs for the logs, HTTP metrics, optional Server-Timing header
+app.add_middleware(RequestContextMiddleware, server_timing=config.SERVER_TIMING)
+
+# 🚦 Shed load early instead of queueing unbounded generations
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    log.warning("shedding request", extra={"fields": {
+        "path": request.url.path, "status": exc.status_code, "detail": exc.detail
+    }})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # 📦 Request schema
 class ChatRequest(BaseModel):
     question: str
@@ -26,6 +83,12 @@ class ChatResponse(BaseModel):
     answer: str
     source: str
 
+def question_fields(question: str) -> dict:
+    fields = {"chars": len(question)}
+    if config.LOG_QUESTIONS:
+        fields["question"] = question
+    return fields
+
 # 🧠 Core chat endpoint
 @app.post("/chat", response_model=ChatResponse)
 async def chat_with_user(payload: ChatRequest):
@@ -34,14 +97,111 @@ async def chat_with_user(payload: ChatRequest):
     if not question:
         return {"answer": "⚠️ Please enter a valid legal question.", "source": "fallback_llm"}
 
-    print(f"[Agent] User question: {question}")
-    
-    result = await query_legal_assistant(question)
+    log.info("question", extra={"fields": question_fields(question)})
+    start = time.perf_counter()
+    try:
+        result = await query_legal_assistant(question)
+    except Exception as e:
+        ERRORS.inc(endpoint="/chat", type=type(e).__name__)
+        log.exception("chat failed", extra={"fields": {"error": type(e).__name__}})
+        raise
 
-    print(f"[Agent] Response Source: {result['source']}")
+    log.info("answered", extra={"fields": {
+        "source": result["source"], "ms": round((time.perf_counter() - start) * 1000, 1), "stages": request_timings()
+    }})
     return result
 
+# 🌊 Streaming chat endpoint (Server-Sent Events)
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream(payload: ChatRequest):
+    """
+    Streams `meta` (source, retrieved section IDs), then one `token` event
+    per LLM chunk, then `done` with the full answer. Errors end the stream
+    with an `error` event.
+    """
+    question = payload.question.strip()
+
+    if not question:
+        async def empty():
+            yield sse("meta", {"source": "fallback_llm", "section_ids": []})
+            yield sse("done", {"source": "fallback_llm", "answer": "⚠️ Please enter a valid legal question."})
+        return StreamingResponse(empty(), media_type="text/event-stream")
+
+    log.info("question", extra={"fields": {**question_fields(question), "stream": True}})
+    start = time.perf_counter()
+
+    # Prime the generator: retrieval and LLM admission run before the response
+    # starts, so an Overloaded rejection still becomes a 429/503 status
+    stream = stream_legal_assistant(question)
+    try:
+        event, data = await stream.__anext__()
+    except Exception as e:
+        ERRORS.inc(endpoint="/chat/stream", type=type(e).__name__)
+        log.exception("chat stream failed", extra={"fields": {"error": type(e).__name__}})
+        raise
+
+    async def events():
+        yield sse(event, data)
+        try:
+            async for next_event, next_data in stream:
+                if next_event == "done":
+                    timings = request_timings()
+                    log.info("answered", extra={"fields": {
+                        "source": next_data["source"], "stream": True,
+                        "ms": round((time.perf_counter() - start) * 1000, 1), "stages": timings
+                    }})
+                    # Headers went out before generation; the final event carries the full breakdown
+                    if config.SERVER_TIMING:
+                        next_data = {**next_data, "timings": timings}
+                yield sse(next_event, next_data)
+        except Exception as e:
+            ERRORS.inc(endpoint="/chat/stream", type=type(e).__name__)
+            log.exception("chat stream failed", extra={"fields": {"error": type(e).__name__}})
+            yield sse("error", {"detail": str(e)})
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 app.include_router(acts_router, prefix="/api")
+app.include_router(sections_router, prefix="/api")
+
+# 📊 Pipeline statistics
+@app.get("/stats")
+async def stats():
+    return {
+        "embedding_batcher": embedding_batcher.stats(),
+        "llm_gate": llm_gate.stats(),
+        "executors": executor_stats(),
+    }
+
+# 📈 Prometheus metrics: stage latency histograms, answer sources, cache hits, errors
+registry.register(Gauge(
+    "bharatlaw_llm_slots", "LLM admission gate occupancy",
+    lambda: {("active",): llm_gate.active, ("waiting",): llm_gate.waiting}, ("state",)))
+registry.register(Gauge(
+    "bharatlaw_embedding_queue_depth", "Questions waiting for a batched embedding",
+    lambda: {(): embedding_batcher.stats()["queue_depth"]}))
+registry.register(Gauge(
+    "bharatlaw_ready", "1 once the retrievers for RETRIEVAL_MODE are loaded",
+    lambda: {(): int(resources.ready)}))
+
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# 🚦 Readiness probe: 503 until the retrievers for RETRIEVAL_MODE are loaded
+@app.get("/ready")
+async def ready():
+    status = resources.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
 
 # ✅ Health check (optional)
 @app.get("/")
@@ -0,0 +1,241 @@
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from rag.citations import extract_citations
+from rag.logs import get_logger
+from ingest.section_index import act_key, normalize_section
+
+log = get_logger("answer_cache")
+
+_NUMBER_PATTERN = re.compile(r"\d+[a-z]*")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return " ".join(question.lower().split()).strip(" ?.!")
+
+
+def citation_keys(question: str) -> list:
+    """Sorted [act_key, section] pairs cited by the question ("302 IPC" → [["ipc", "302"]])."""
+    return sorted({(act_key(act), normalize_section(section)) for act, section in extract_citations(question)})
+
+
+class AnswerCache:
+    """
+    Two-level answer cache for the chat endpoint.
+
+    Level 1 is an exact lookup on the normalized question. Level 2 compares
+    the query embedding (already computed for retrieval) with the cached
+    question embeddings and reuses an answer above `similarity_threshold`.
+    Entries expire after `ttl_seconds`, the least recently used entry is
+    evicted beyond `max_entries`, and the cache can be persisted to `path`
+    so a restart starts warm.
+
+    Answers are saved as JSON at `path` and question embeddings as a float32
+    .npz next to it. Periodic saves take a snapshot on the calling thread and
+    write it on a background thread, so `put()` never blocks the event loop
+    on disk I/O.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400,
+                 similarity_threshold: float = 0.95, path: Optional[str] = None,
+                 persist_every: int = 20):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.path = path
+        self.persist_every = persist_every
+
+        self._entries = OrderedDict()  # normalized question -> entry dict
+        self._matrix = None            # unit vectors of entries with embeddings
+        self._matrix_keys = []
+        self._dirty = False
+        self._unsaved = 0
+        self._writer = None   # single background thread for periodic saves
+        self._pending_save = None
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, entry) -> bool:
+        return time.time() - entry["created"] > self.ttl_seconds
+
+    def _evict(self, key):
+        self._entries.pop(key, None)
+        self._dirty = True
+
+    def get_exact(self, question: str) -> Optional[dict]:
+        key = normalize_question(question)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry):
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_similar(self, question: str, embedding) -> Optional[dict]:
+        """Best cached entry whose question embedding is close enough to `embedding`."""
+        if not self._entries:
+            return None
+        if self._dirty:
+            self._rebuild_matrix()
+        if self._matrix is None:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        scores = self._matrix @ query
+        # Paraphrases must still cite the same sections of the same acts
+        # ("Section 302 IPC" ≠ "Section 302 CrPC"); without citations, the same numbers
+        normalized = normalize_question(question)
+        citations = [list(pair) for pair in citation_keys(normalized)]
+        numbers = sorted(_NUMBER_PATTERN.findall(normalized))
+        for i in np.argsort(-scores):
+            if scores[i] < self.similarity_threshold:
+                return None
+            key = self._matrix_keys[i]
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry):
+                self._evict(key)
+                continue
+            if citations or entry["citations"]:
+                if entry["citations"] != citations:
+                    continue
+            elif entry["numbers"] != numbers:
+                continue
+            self._entries.move_to_end(key)
+            return entry
+        return None
+
+    def put(self, question: str, embedding, answer: str, source: str):
+        key = normalize_question(question)
+        self._entries[key] = {
+            "answer": answer,
+            "source": source,
+            "created": time.time(),
+            "numbers": sorted(_NUMBER_PATTERN.findall(key)),
+            "citations": [list(pair) for pair in citation_keys(key)],
+            "embedding": None if embedding is None else np.asarray(embedding, dtype=np.float32),
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+        self._unsaved += 1
+        if self.path and self._unsaved >= self.persist_every:
+            self.save_in_background()
+
+    def _rebuild_matrix(self):
+        keys, vectors = [], []
+        for key, entry in self._entries.items():
+            if entry["embedding"] is not None:
+                keys.append(key)
+                vectors.append(entry["embedding"])
+        if vectors:
+            matrix = np.stack(vectors)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            self._matrix = matrix / np.where(norms == 0, 1.0, norms)
+        else:
+            self._matrix = None
+        self._matrix_keys = keys
+        self._dirty = False
+
+    @property
+    def embeddings_path(self) -> str:
+        return os.path.splitext(self.path)[0] + ".embeddings.npz"
+
+    def _snapshot(self):
+        """Live entries without their vectors, plus (keys, vectors); cheap enough for the event loop."""
+        entries, keys, vectors = [], [], []
+        for key, entry in self._entries.items():
+            if self._expired(entry):
+                continue
+            entries.append((key, {k: v for k, v in entry.items() if k != "embedding"}))
+            if entry["embedding"] is not None:
+                keys.append(key)
+                vectors.append(entry["embedding"])
+        self._unsaved = 0
+        return entries, keys, vectors
+
+    def _write(self, snapshot):
+        entries, keys, vectors = snapshot
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Vectors first: they are matched to answers by question, so a crash
+        # between the two replaces never pairs an answer with the wrong vector
+        tmp_path = self.embeddings_path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            keys=np.asarray(keys, dtype=str),
+            vectors=np.stack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32),
+        )
+        os.replace(tmp_path, self.embeddings_path)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def save_in_background(self):
+        """Snapshot now and write on the cache's writer thread; skipped while a save is in flight."""
+        if not self.path or (self._pending_save is not None and not self._pending_save.done()):
+            return
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="answer-cache")
+        self._pending_save = self._writer.submit(self._write, self._snapshot())
+        self._pending_save.add_done_callback(self._report_save)
+
+    def _report_save(self, future):
+        if future.exception() is not None:
+            log.error("answer cache save failed", extra={"fields": {
+                "path": self.path, "error": repr(future.exception())
+            }})
+
+    def save(self):
+        """Write synchronously, after any background save (used at shutdown)."""
+        if not self.path:
+            return
+        if self._pending_save is not None:
+            self._pending_save.exception()  # waits; a failed save was already reported
+        self._write(self._snapshot())
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("answer cache load failed", extra={"fields": {"path": self.path, "error": repr(e)}})
+            return
+        vectors = {}
+        if os.path.exists(self.embeddings_path):
+            try:
+                with np.load(self.embeddings_path) as data:
+                    vectors = dict(zip(data["keys"].tolist(), data["vectors"]))
+            except (OSError, ValueError, KeyError) as e:
+                log.warning("answer cache embeddings load failed", extra={"fields": {
+                    "path": self.embeddings_path, "error": repr(e)
+                }})
+        for key, entry in items[-self.max_entries:]:
+            if not self._expired(entry):
+                # Files written before the .npz split kept the vector inline as a list
+                embedding = entry.get("embedding")
+                entry["embedding"] = vectors.get(key) if embedding is None else np.asarray(embedding, dtype=np.float32)
+                if "citations" not in entry:
+                    entry["citations"] = [list(pair) for pair in citation_keys(key)]
+                self._entries[key] = entry
+        self._dirty = True
+        log.info("answer cache loaded", extra={"fields": {"path": self.path, "entries": len(self._entries)}})
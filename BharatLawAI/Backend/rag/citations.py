@@ -0,0 +1,67 @@
+import os
+import re
+import sys
+
+# ✅ Access shared ingest modules from the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from ingest.parse_indialaw_db import ACT_TABLES
+
+# "Section 246", "Sec. 498-A", "S. 302", "Sections 34 and 302"
+_SECTION_NO = r"\d+(?:-?[a-z]{1,2})?"
+SECTION_PATTERN = re.compile(
+    rf"\b(?:sections?|secs?\.?|ss?\.)\s*({_SECTION_NO}(?:\s*(?:,|and|&|/)\s*{_SECTION_NO})*)\b",
+    re.IGNORECASE
+)
+
+def _act_pattern(alias: str) -> str:
+    # Abbreviations may be dotted ("Cr.P.C.", "I.P.C"); titles may drop the year
+    if alias.isalpha() and alias.islower():
+        return r"\.?\s?".join(re.escape(ch) for ch in alias) + r"\.?"
+    return re.escape(alias).replace(r"\ ", r"\s+")
+
+_ACT_ALIASES = []
+for table, title in ACT_TABLES.items():
+    _ACT_ALIASES.append((table, title))
+    _ACT_ALIASES.append((title, title))
+    _ACT_ALIASES.append((re.sub(r",?\s*\d{4}$", "", title), title))
+
+# Longest aliases first so "Indian Penal Code, 1860" wins over "Indian Penal Code"
+_ACT_ALIASES.sort(key=lambda pair: len(pair[0]), reverse=True)
+ACT_PATTERN = re.compile(
+    r"\b(" + "|".join(f"(?:{_act_pattern(alias)})" for alias, _ in _ACT_ALIASES) + r")(?![\w])",
+    re.IGNORECASE
+)
+
+def _resolve_act(mention: str) -> str:
+    flat = re.sub(r"[^a-z0-9]", "", mention.lower())
+    for alias, title in _ACT_ALIASES:
+        if re.sub(r"[^a-z0-9]", "", alias.lower()) == flat:
+            return title
+    return ""
+
+def extract_citations(question: str) -> list:
+    """
+    Find explicit section citations such as "Section 246 of IPC" or
+    "CrPC s. 154". Returns [(act title, section number), ...] in order of
+    appearance; a citation without a recognisable act is ignored.
+    """
+    section_mentions = list(SECTION_PATTERN.finditer(question))
+    if not section_mentions:
+        return []
+
+    act_mentions = [(m.start(), _resolve_act(m.group(1))) for m in ACT_PATTERN.finditer(question)]
+    act_mentions = [(pos, act) for pos, act in act_mentions if act]
+    if not act_mentions:
+        return []
+
+    citations = []
+    for mention in section_mentions:
+        # "Section 302 of IPC" names the act after the number, "CrPC s. 154" before it
+        following = [act for pos, act in act_mentions if pos >= mention.end()]
+        preceding = [act for pos, act in act_mentions if pos < mention.start()]
+        act = following[0] if following else preceding[-1]
+        for number in re.findall(_SECTION_NO, mention.group(1), re.IGNORECASE):
+            citation = (act, number.replace("-", "").upper())
+            if citation not in citations:
+                citations.append(citation)
+    return citations
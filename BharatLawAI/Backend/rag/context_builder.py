@@ -0,0 +1,111 @@
+import re
+
+# Llama-style tokenizers average roughly four characters of English per token
+CHARS_PER_TOKEN = 4
+MAX_OVERLAP_WORDS = 120
+_CHUNK_SUFFIX = re.compile(r"_\d+$")
+# "[Act | Section ...]" line ingest/chunking.py puts on every chunk; the block header repeats it
+_CONTEXT_LINE = re.compile(r"^\[[^\]\n]*\]\n")
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _join(left: str, right: str) -> str:
+    """Concatenate consecutive chunks, dropping words the chunker repeated as overlap."""
+    left_words, right_words = left.split(), right.split()
+    for n in range(min(len(left_words), len(right_words), MAX_OVERLAP_WORDS), 0, -1):
+        if left_words[-n:] == right_words[:n]:
+            return " ".join(left_words + right_words[n:])
+    return left.rstrip() + " " + right.lstrip()
+
+
+def _shingles(text: str, size: int = 3) -> set:
+    words = re.findall(r"\w+", text.lower())
+    return {tuple(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+
+
+def _similar(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _section_key(uid: str, meta: dict) -> tuple:
+    if meta.get("section_no"):
+        return meta.get("act", ""), meta["section_no"]
+    # No metadata to group on: chunk IDs are "{act}_{section}_{idx}"
+    return "", _CHUNK_SUFFIX.sub("", uid)
+
+
+def _header(meta: dict, uid: str) -> str:
+    section_no = meta.get("section_no") or uid
+    heading = meta.get("heading")
+    act = meta.get("act")
+    header = f"{section_no} - {heading}" if heading else section_no
+    return f"{header} ({act})" if act else header
+
+
+def build_context(hits: list, max_tokens: int, duplicate_threshold: float = 0.9) -> tuple:
+    """
+    Turn retrieved chunks into a prompt context that fits `max_tokens`.
+
+    `hits` are (id, document, metadata, score) tuples, higher score better.
+    Chunks of the same section are grouped and consecutive `chunk_index`
+    pieces merged under one header; sections are ordered by their best
+    chunk's score; a section whose text nearly repeats one already kept is
+    dropped; sections are added until the budget runs out, the last one cut
+    at a word boundary. Missing metadata (heading, act, chunk_index) is
+    tolerated.
+
+    Returns (context, ids of the chunks used).
+    """
+    sections = {}
+    for uid, doc, meta, score in hits:
+        meta = meta or {}
+        section = sections.setdefault(_section_key(uid, meta), {"score": score, "meta": meta, "chunks": {}})
+        section["score"] = max(section["score"], score)
+        # Unnumbered chunks (e.g. whole sections from rag/embed_store.py) are kept apart, never merged
+        index = meta.get("chunk_index")
+        key = (0, int(index)) if index is not None else (1, uid)
+        section["chunks"].setdefault(key, (uid, _CONTEXT_LINE.sub("", doc or "", count=1)))
+
+    blocks, used_ids, kept_shingles = [], [], []
+    remaining = max_tokens
+    for section in sorted(sections.values(), key=lambda s: s["score"], reverse=True):
+        # Merge runs of consecutive chunk indexes; gaps are marked with "..."
+        parts, ids, previous = [], [], None
+        for key in sorted(section["chunks"]):
+            uid, doc = section["chunks"][key]
+            if key[0] == 0 and previous is not None and key[1] == previous + 1:
+                parts[-1] = _join(parts[-1], doc)
+            else:
+                parts.append(doc.strip())
+            ids.append(uid)
+            previous = key[1] if key[0] == 0 else None
+        text = " ... ".join(p for p in parts if p)
+        if not text:
+            continue
+
+        shingles = _shingles(text)
+        if any(_similar(shingles, kept) >= duplicate_threshold for kept in kept_shingles):
+            continue
+
+        header = _header(section["meta"], ids[0])
+        block = f"{header}\n{text}"
+        cost = estimate_tokens(block) + 1
+        if cost > remaining:
+            # Keep a truncated final section if a useful amount still fits
+            room = (remaining - estimate_tokens(header) - 2) * CHARS_PER_TOKEN
+            if room < 200:
+                break
+            block = f"{header}\n{text[:room].rsplit(' ', 1)[0]} ..."
+            cost = remaining
+
+        blocks.append(block)
+        used_ids.extend(ids)
+        kept_shingles.append(shingles)
+        remaining -= cost
+        if remaining <= 0:
+            break
+
+    return "\n\n".join(blocks), used_ids
@@ -0,0 +1,120 @@
+import asyncio
+import functools
+import time
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent `encode` calls into batched forward passes.
+
+    Requests wait at most `max_wait_ms` (or until `max_batch_size` requests
+    are queued) before one `encode` call on the model returned by `get_model`
+    embeds the whole batch in `executor`. Each caller gets back its own
+    vector as a list of floats.
+    """
+
+    def __init__(self, get_model, max_batch_size: int = 32, max_wait_ms: float = 5.0, executor=None):
+        self.get_model = get_model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+
+        self._queue = None
+        self._worker = None
+
+        # 📊 Metrics
+        self.batches = 0
+        self.requests = 0
+        self.max_batch_seen = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_encode_time = 0.0
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def encode(self, text: str) -> list:
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued before waiting for stragglers
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _encode(self, texts: list):
+        # Runs in the executor, so a first-use model load never blocks the event loop
+        return self.get_model().encode(texts, batch_size=len(texts), show_progress_bar=False)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # Callers that were cancelled while queued don't need a vector
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                wait = started - enqueued
+                self.total_queue_wait += wait
+                self.max_queue_wait = max(self.max_queue_wait, wait)
+
+            texts = [text for text, _, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(
+                    self.executor, functools.partial(self._encode, texts)
+                )
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self.total_encode_time += time.perf_counter() - started
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            for (_, future, _), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector.tolist())
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_seen,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_queue_wait_ms": 1000 * self.total_queue_wait / self.requests if self.requests else 0.0,
+            "max_queue_wait_ms": 1000 * self.max_queue_wait,
+            "avg_encode_ms": 1000 * self.total_encode_time / self.batches if self.batches else 0.0,
+        }
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
@@ -1,21 +1,26 @@
 import os
 import re
-import asyncio
-import functools
-from uuid import uuid4
+import sys
+import argparse
+from itertools import chain
+from collections import Counter
 from chromadb import PersistentClient
-from sentence_transformers import SentenceTransformer
+
+# ✅ Access shared ingest modules from the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from ingest.embed_pipeline import embed_and_write
+from ingest.embedders import BACKENDS, load_embedder
+from ingest.index_manifest import IndexManifest, embedder_fingerprint
+from ingest.section_index import act_key, normalize_section
 
 # ChromaDB setup
 DB_DIR = "./chroma_db"
-client = PersistentClient(path=DB_DIR)
 collection_name = "legal_assistant"
+# Separate from rag/embed_store.py's manifest so neither run deletes the other's chunks
+manifest_path = os.path.join(DB_DIR, f"{collection_name}.txt.manifest.json")
 
-# Embedding model
-model = SentenceTransformer("all-MiniLM-L6-v2")
-
-# Create collection (or get if it exists)
-collection = client.get_or_create_collection(collection_name)
+# Embedding model: must match the query embedder (config.EMBEDDING_MODEL)
+MODEL_NAME = "BAAI/bge-small-en-v1.5"
 
 # 🔍 Pattern to detect section blocks like "Section 246. Title"
 section_pattern = re.compile(r"(Section\s+\d+\.\s.*?)(?=Section\s+\d+\.|\Z)", re.DOTALL | re.IGNORECASE)
@@ -35,49 +40,73 @@ def extract_section_no(section_text: str) -> str:
     match = re.match(r"(Section\s+\d+\.)", section_text.strip(), re.IGNORECASE)
     return match.group(1).strip() if match else "Unknown"
 
-async def embed_and_store(filepath: str):
-    loop = asyncio.get_event_loop()
-
-    # Read file asynchronously
-    content = await loop.run_in_executor(None, functools.partial(open, filepath, "r", encoding="utf-8"))
-    with content as f:
-        file_content = await loop.run_in_executor(None, f.read)
+def iter_sections(filepath: str):
+    """Yield (id, section_text, metadata) items for every section block in a file."""
+    with open(filepath, "r", encoding="utf-8") as f:
+        file_content = f.read()
 
     sections = section_pattern.findall(file_content)
     act = extract_act_from_filename(filepath)
     print(f"📖 Processing {len(sections)} sections from {act} ({filepath})")
 
+    # Stable `{file}_{section}_{idx}` IDs so re-runs only touch changed sections; the file
+    # stem keeps IDs unique when several files map to the same act (or to "Unknown")
+    source = re.sub(r"[^\w]", "_", os.path.splitext(os.path.basename(filepath))[0])
+    occurrences = Counter()
     for section_text in sections:
         section_no = extract_section_no(section_text)
-        doc_id = str(uuid4())
-        
-        # Encode embedding asynchronously
-        embedding = await loop.run_in_executor(None, functools.partial(model.encode, section_text))
-        embedding = embedding.tolist()
+        section = re.sub(r"[^\w]", "", section_no)
+        idx = occurrences[section]
+        occurrences[section] += 1
+        yield f"{source}_{section}_{idx}", section_text, {
+            "section_no": section_no,
+            "act": act,
+            # Same normalised keys as the JSONL chunks, for exact citation filters
+            "act_key": act_key(act),
+            "section_key": normalize_section(section_no)
+        }
 
-        # Add to collection asynchronously
-        await loop.run_in_executor(
-            None, functools.partial(
-                collection.add,
-                documents=[section_text],
-                ids=[doc_id],
-                embeddings=[embedding],
-                metadatas=[{
-                    "section_no": section_no,
-                    "act": act
-                }]
-            )
-        )
-        print(f"✅ Stored: {section_no} | Act: {act} | ID: {doc_id[:8]}...")
-
-async def main():
+def main(batch_size: int = 64, write_batch: int = 1024, workers: int = 0, embedder: str = "torch",
+         rebuild: bool = False):
     print("🚀 Starting embedding process...")
-    tasks = []
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith(".txt"):
-            tasks.append(embed_and_store(os.path.join(DATA_DIR, filename)))
-    await asyncio.gather(*tasks)
+    # Loaded here rather than at import time, so importing this module stays cheap
+    model = load_embedder(embedder, MODEL_NAME)
+    client = PersistentClient(path=DB_DIR)
+    manifest = IndexManifest(manifest_path)
+
+    # Vectors from another model (e.g. the old all-MiniLM-L6-v2, also 384-dim) would
+    # silently mix with new ones, so a model or backend switch drops the collection
+    if not rebuild and not manifest.built_with(model):
+        print(f"♻️ Collection was embedded with {manifest.embedder or 'an unrecorded model'}, "
+              f"now {embedder_fingerprint(model)}: rebuilding")
+        rebuild = True
+    if rebuild:
+        try:
+            client.delete_collection(collection_name)
+        except Exception:
+            pass  # nothing to drop yet
+        manifest.clear()
+    collection = client.get_or_create_collection(collection_name)
+
+    filepaths = [
+        os.path.join(DATA_DIR, filename)
+        for filename in sorted(os.listdir(DATA_DIR))
+        if filename.endswith(".txt")
+    ]
+    items = chain.from_iterable(iter_sections(path) for path in filepaths)
+    embed_and_write(
+        items, model, collection,
+        batch_size=batch_size, write_batch=write_batch, workers=workers,
+        manifest=manifest
+    )
     print("✅ All files processed and embedded into ChromaDB.")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Embed section text files into ChromaDB")
+    parser.add_argument("--batch-size", type=int, default=64, help="sections per encode forward pass")
+    parser.add_argument("--write-batch", type=int, default=1024, help="sections per Chroma upsert call")
+    parser.add_argument("--workers", type=int, default=0, help="encoder processes (0/1 = in-process)")
+    parser.add_argument("--embedder", choices=BACKENDS, default="torch", help="embedding backend")
+    parser.add_argument("--rebuild", action="store_true", help="drop the collection and re-embed everything")
+    args = parser.parse_args()
+    main(args.batch_size, args.write_batch, args.workers, args.embedder, args.rebuild)
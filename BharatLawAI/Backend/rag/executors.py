@@ -0,0 +1,116 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import config
+
+# 🧵 Dedicated pools for the blocking stages, so embedding and Chroma calls
+# never queue behind each other in the default executor. LLM calls are async
+# (see rag/llm_client.py) and bounded by `llm_gate` instead.
+embed_executor = ThreadPoolExecutor(max_workers=config.EMBED_WORKERS, thread_name_prefix="embed")
+retrieval_executor = ThreadPoolExecutor(max_workers=config.RETRIEVAL_WORKERS, thread_name_prefix="retrieval")
+
+EXECUTORS = {
+    "embed": embed_executor,
+    "retrieval": retrieval_executor,
+}
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of queued; mapped to 429/503 by the API."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    Concurrency limit with a bounded wait queue.
+
+    At most `max_concurrency` holders run at once and at most `max_queue`
+    more may wait. A request arriving at a full queue is rejected with 429
+    immediately; one that waits longer than `queue_timeout` seconds gets 503.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # 📊 Metrics
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self):
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(429, f"Too many pending {self.name} requests, please retry shortly")
+
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise Overloaded(503, f"Timed out waiting for a free {self.name} slot", retry_after=5)
+        finally:
+            self.waiting -= 1
+            waited = time.perf_counter() - start
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+        self.active += 1
+        self.admitted += 1
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        attempts = self.admitted + self.timed_out
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": 1000 * self.total_wait / attempts if attempts else 0.0,
+            "max_wait_ms": 1000 * self.max_wait,
+        }
+
+
+llm_gate = AdmissionGate(
+    "LLM",
+    max_concurrency=config.LLM_MAX_CONCURRENCY,
+    max_queue=config.LLM_MAX_QUEUE,
+    queue_timeout=config.LLM_QUEUE_TIMEOUT_SECONDS,
+)
+
+
+def executor_stats() -> dict:
+    # _work_queue holds submitted jobs that no worker thread has picked up yet
+    return {
+        name: {"workers": executor._max_workers, "queued": executor._work_queue.qsize()}
+        for name, executor in EXECUTORS.items()
+    }
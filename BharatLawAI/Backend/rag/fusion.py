@@ -0,0 +1,13 @@
+def reciprocal_rank_fusion(rankings: list, k: int = 60, limit: int = None) -> list:
+    """
+    Merge ranked ID lists (best first) with reciprocal-rank fusion:
+    score(id) = sum over rankings of 1 / (k + rank). Only ranks are used, so
+    BM25 scores and cosine distances never need to be put on one scale.
+    Returns [(id, score)] best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    fused = sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+    return fused[:limit] if limit else fused
@@ -1,3 +1,7 @@
+import re
+
+import numpy as np
+
 INTENTS = {
     "greeting": ["hi", "hello", "hey", "good morning", "good evening"],
     "goodbye": ["bye", "goodbye", "see you", "take care"],
@@ -7,16 +11,83 @@ INTENTS = {
     "legal_query": ["section", "act", "law", "ipc", "procedure", "legal"]
 }
 
+# legal_query keywords win over everything else ("hi, what does section 302 say?"),
+# then the remaining intents in the order they are listed above
+_PRIORITY = ["legal_query"] + [intent for intent in INTENTS if intent != "legal_query"]
+
+
+def _normalize(text: str) -> str:
+    # Curly apostrophes ("you’re") match their straight form and vice versa
+    return text.lower().replace("’", "'")
+
+
+def _keyword_pattern(keyword: str) -> str:
+    return r"\s+".join(re.escape(word) for word in _normalize(keyword).split())
+
+
+# One alternation with a named group per intent, compiled once at import.
+# Word boundaries stop "hi" from matching inside "which" or "great" inside "greater".
+_INTENT_PATTERN = re.compile(
+    r"\b(?:" + "|".join(
+        f"(?P<{intent}>" + "|".join(
+            _keyword_pattern(k) for k in sorted(INTENTS[intent], key=len, reverse=True)
+        ) + ")"
+        for intent in _PRIORITY
+    ) + r")\b"
+)
+
+
 def classify_intent(text: str) -> str:
     """
     Classifies the user's message as a predefined intent
-    using keyword matching (fallback to 'legal_query').
+    using whole-word keyword matching (fallback to 'legal_query').
+    Cheap enough to call inline on the event loop.
     """
-    text_lower = text.lower()
-    for intent, keywords in INTENTS.items():
-        if intent == "legal_query": # legal_query is the fallback, check others first
-            continue
-        for keyword in keywords:
-            if keyword in text_lower:
-                return intent
+    found = {match.lastgroup for match in _INTENT_PATTERN.finditer(_normalize(text))}
+    for intent in _PRIORITY:
+        if intent in found:
+            return intent
     return "legal_query"
+
+
+class EmbeddingIntentClassifier:
+    """
+    Optional second opinion that reuses the query embedding already computed
+    for retrieval: the message is compared against centroids of the INTENTS
+    examples and only a confident match with a non-legal intent is reported.
+    """
+
+    def __init__(self, encode, threshold: float = 0.8, examples: dict = INTENTS):
+        self._encode = encode
+        self.threshold = threshold
+        self.examples = examples
+        self._intents = None
+        self._centroids = None
+
+    @property
+    def ready(self) -> bool:
+        return self._centroids is not None
+
+    def build(self):
+        """Embed the example phrases (blocking; run it off the event loop)."""
+        intents, centroids = [], []
+        for intent, phrases in self.examples.items():
+            vectors = np.asarray(self._encode(list(phrases)), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+            centroid = vectors.mean(axis=0)
+            centroids.append(centroid / (np.linalg.norm(centroid) + 1e-12))
+            intents.append(intent)
+        self._intents = intents
+        self._centroids = np.stack(centroids)
+
+    def classify(self, embedding):
+        """Return the matching intent, or None when no centroid is close enough."""
+        if self._centroids is None:
+            self.build()
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) + 1e-12)
+        scores = self._centroids @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self._intents[best]
@@ -0,0 +1,85 @@
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+import ollama
+
+import config
+from rag.logs import get_logger
+
+log = get_logger("llm")
+
+
+class LLMClient:
+    """
+    Shared async Ollama client.
+
+    One `ollama.AsyncClient` with a bounded httpx connection pool is reused
+    by every request, so calls stay on the event loop instead of hopping
+    through worker threads. Every request carries `keep_alive`, keeping the
+    models resident between bursts, and `warmup()` loads them at startup.
+    """
+
+    def __init__(self, host: Optional[str] = None, pool_size: int = 8,
+                 keep_alive: str = "30m", options: Optional[dict] = None,
+                 timeout: float = 180.0):
+        self.keep_alive = keep_alive
+        self.options = options or {}
+        self.warm_models = set()
+        self._client = ollama.AsyncClient(
+            host=host,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            # The read timeout bounds both a full completion and the gap between streamed chunks
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+
+    async def chat(self, model: str, messages: List[Dict[str, str]]) -> str:
+        response = await self._client.chat(
+            model=model,
+            messages=messages,
+            options=self.options,
+            keep_alive=self.keep_alive,
+        )
+        return response["message"]["content"]
+
+    async def stream(self, model: str, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        chunks = await self._client.chat(
+            model=model,
+            messages=messages,
+            options=self.options,
+            keep_alive=self.keep_alive,
+            stream=True,
+        )
+        try:
+            async for chunk in chunks:
+                text = chunk["message"]["content"]
+                if text:
+                    yield text
+        finally:
+            # `async for` does not close the inner generator when this one is closed;
+            # doing it here ends the httpx stream now rather than at garbage collection
+            await chunks.aclose()
+
+    async def warmup(self, models: List[str]):
+        """Load each model into memory with an empty prompt so the first user request doesn't pay for it."""
+        for model in dict.fromkeys(models):
+            try:
+                await self._client.generate(model=model, prompt="", keep_alive=self.keep_alive)
+                self.warm_models.add(model)
+                log.info("model warmed up", extra={"fields": {"model": model}})
+            except Exception as e:
+                log.warning("model warmup failed", extra={"fields": {"model": model, "error": repr(e)}})
+
+    async def close(self):
+        if hasattr(self._client, "close"):
+            await self._client.close()
+        else:
+            await self._client._client.aclose()
+
+
+llm_client = LLMClient(
+    host=config.OLLAMA_HOST,
+    pool_size=config.LLM_POOL_SIZE,
+    keep_alive=config.LLM_KEEP_ALIVE,
+    options=config.LLM_OPTIONS,
+    timeout=config.LLM_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,71 @@
+# backend/rag/logs.py
+#
+# Structured logging for the API. Every record carries the request ID bound
+# by RequestContextMiddleware, plus any `fields` passed through `extra`:
+#
+#   log = get_logger("chat")
+#   log.info("answered", extra={"fields": {"source": "vector_db", "ms": 812}})
+#
+# LOG_FORMAT=json emits one JSON object per line (for log shippers);
+# LOG_FORMAT=text keeps a readable single line for local development.
+
+import json
+import logging
+import sys
+import time
+
+import config
+from rag.metrics import request_id_var
+
+_configured = False
+
+
+class _RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        fields = " ".join(f"{key}={value!r}" for key, value in getattr(record, "fields", {}).items())
+        line = f"{self.formatTime(record)} {record.levelname:<7} [{getattr(record, 'request_id', '-')}] " \
+               f"{record.name}: {record.getMessage()}" + (f" {fields}" if fields else "")
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def configure_logging():
+    """Install the handler on the `bharatlaw` logger once (idempotent, safe under --reload)"""
+    global _configured
+    if _configured:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if config.LOG_FORMAT == "json" else TextFormatter())
+    handler.addFilter(_RequestIdFilter())
+    root = logging.getLogger("bharatlaw")
+    root.addHandler(handler)
+    root.setLevel(config.LOG_LEVEL.upper())
+    root.propagate = False
+    _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    configure_logging()
+    return logging.getLogger(f"bharatlaw.{name}")
@@ -0,0 +1,220 @@
+# backend/rag/metrics.py
+#
+# Request-scoped stage timings and process-wide Prometheus metrics.
+#
+#   with stage("embed"):              time one pipeline stage; lands in the
+#       ...                           stage histogram and in the current
+#                                     request's timings (Server-Timing)
+#   ANSWERS.inc(source="vector_db")   counters / histograms below
+#   registry.render()                 Prometheus text exposition for /metrics
+#
+# Metrics are plain dicts under a lock rather than prometheus_client, so the
+# backend gains no dependency; the output follows text format 0.0.4.
+
+import bisect
+import contextvars
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# 🪪 Per-request state, propagated through awaits (and into executors via copy_context)
+request_id_var = contextvars.ContextVar("request_id", default="-")
+_timings_var = contextvars.ContextVar("timings", default=None)
+_VALID_REQUEST_ID = re.compile(r"[\w.:-]{1,64}")
+
+# Seconds; wide enough for a cached answer (~1 ms) and a cold LLM call (minutes)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, key + (f'{bound:g}',))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(names, key + ('+Inf',))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {series[-1]}")
+        return lines
+
+
+class Gauge:
+    """Read at scrape time from `read()`, which returns {label values tuple: value}"""
+
+    def __init__(self, name: str, help: str, read, labels: tuple = ()):
+        self.name, self.help, self.labels, self.read = name, help, tuple(labels), read
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        lines += [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in sorted(self.read().items())]
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "bharatlaw_http_requests_total", "HTTP requests by route and status code", ("route", "method", "status")))
+REQUEST_SECONDS = registry.register(Histogram(
+    "bharatlaw_http_request_seconds", "Time to the end of the HTTP response", ("route", "method")))
+STAGE_SECONDS = registry.register(Histogram(
+    "bharatlaw_stage_seconds", "Time spent in each answer pipeline stage", ("stage",)))
+ANSWERS = registry.register(Counter(
+    "bharatlaw_answers_total", "Answers by source (intent_classifier, vector_db, fallback_llm, cache_*, ...)",
+    ("source",)))
+CACHE_LOOKUPS = registry.register(Counter(
+    "bharatlaw_answer_cache_lookups_total", "Answer cache lookups by level and result", ("level", "result")))
+ERRORS = registry.register(Counter(
+    "bharatlaw_errors_total", "Failed requests by endpoint and exception type", ("endpoint", "type")))
+
+
+# ⏱️ Stage spans
+
+def start_request(request_id: str = None) -> tuple:
+    """Bind a request ID and a fresh timings dict to the current context; returns (id, timings)"""
+    request_id = request_id or uuid.uuid4().hex[:16]
+    timings = {}
+    request_id_var.set(request_id)
+    _timings_var.set(timings)
+    return request_id, timings
+
+
+def request_timings() -> dict:
+    """Stage durations (ms) recorded so far for the current request"""
+    return {name: round(ms, 2) for name, ms in (_timings_var.get() or {}).items()}
+
+
+def record_stage(name: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage=name)
+    timings = _timings_var.get()
+    if timings is not None:
+        # A stage that runs twice in one request accumulates
+        timings[name] = timings.get(name, 0.0) + seconds * 1000
+
+
+@contextmanager
+def stage(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+
+def server_timing(timings: dict) -> str:
+    """`Server-Timing` header value: `embed;dur=12.3, retrieve;dur=4.1`"""
+    return ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
+
+
+# 🪪 ASGI middleware: request IDs, HTTP metrics, Server-Timing
+
+class RequestContextMiddleware:
+    """
+    Tags each HTTP request with an ID (the client's `X-Request-ID` or a new
+    one), counts and times it per route, and echoes the ID as a response
+    header. With `server_timing=True`, stage timings recorded before the
+    response starts are sent as a `Server-Timing` header; for streamed
+    answers that covers everything up to the first event.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        incoming = headers.get(b"x-request-id", b"").decode("latin-1")
+        request_id, timings = start_request(incoming if _VALID_REQUEST_ID.fullmatch(incoming) else None)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_headers(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                extra = [(b"x-request-id", request_id.encode("latin-1"))]
+                if self.server_timing:
+                    total = (time.perf_counter() - start) * 1000
+                    value = server_timing({**timings, "total": total})
+                    extra.append((b"server-timing", value.encode("latin-1")))
+                message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "")
+            REQUESTS.inc(route=route, method=method, status=status)
+            REQUEST_SECONDS.observe(time.perf_counter() - start, route=route, method=method)
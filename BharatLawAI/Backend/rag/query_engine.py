@@ -1,19 +1,48 @@
 import asyncio
+import contextvars
 import functools
-from sentence_transformers import SentenceTransformer
-from chromadb import PersistentClient
-import ollama
+import re
+import time
+import httpx
 
-from rag.intent_classifier import classify_intent
+import config
+from rag.intent_classifier import classify_intent, EmbeddingIntentClassifier
+from rag.answer_cache import AnswerCache
+from rag.embed_batcher import EmbeddingBatcher
+from rag.executors import embed_executor, retrieval_executor, llm_gate, Overloaded
+from rag.llm_client import llm_client
+from rag.citations import extract_citations
+from rag.fusion import reciprocal_rank_fusion
+from rag.context_builder import build_context
+from rag.resources import resources
+from rag.metrics import stage, record_stage, ANSWERS, CACHE_LOOKUPS
+from ingest.section_index import act_key, normalize_section
 
-# Initialize embedder and vector DB client
-embedder = SentenceTransformer("BAAI/bge-small-en-v1.5")
-chroma = PersistentClient(path="./chroma_db")
-collection = chroma.get_collection("legal_assistant")
+# Concurrent requests share batched forward passes of the embedder
+embedding_batcher = EmbeddingBatcher(
+    resources.get_embedder,
+    max_batch_size=config.EMBED_BATCH_MAX_SIZE,
+    max_wait_ms=config.EMBED_BATCH_WAIT_MS,
+    executor=embed_executor,
+)
+
+# 🧭 Optional embedding-based intent check on the retrieval vector
+intent_embedder = EmbeddingIntentClassifier(
+    lambda texts: resources.get_embedder().encode(texts, show_progress_bar=False),
+    threshold=config.INTENT_EMBEDDING_THRESHOLD,
+) if config.INTENT_EMBEDDING_ENABLED else None
 
 # Similarity threshold
 SIMILARITY_THRESHOLD = 0.75
 
+# 💾 Answer cache (exact question → answer, then query-embedding similarity)
+answer_cache = AnswerCache(
+    max_entries=config.ANSWER_CACHE_MAX_ENTRIES,
+    ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS,
+    similarity_threshold=config.ANSWER_CACHE_SIMILARITY,
+    path=config.ANSWER_CACHE_PATH or None,
+) if config.ANSWER_CACHE_ENABLED else None
+
 
 def get_quick_reply(intent: str) -> str:
     responses = {
@@ -26,14 +55,166 @@ def get_quick_reply(intent: str) -> str:
     return responses.get(intent, "How can I assist you with your legal question?")
 
 
-async def query_legal_assistant(question: str, k: int = 5) -> dict:
+def section_id(act: str, section_no: str) -> str:
+    """`{act}_{section}` prefix of the chunk IDs written by rag/embed_store.py"""
+    section = re.sub(r"[^\w]", "", section_no)
+    return f"{act.replace(' ', '_')}_{section}"
+
+
+def build_rag_prompt(question: str, context: str) -> str:
+    return f"""You are a helpful Indian Legal Assistant.
+Use the following legal sections to answer the user's question:
+
+{context}
+
+Question: {question}
+Answer:"""
+
+
+def fetch_cited_sections(citations: list) -> list:
+    """
+    Fetch (act, section) citations directly, without touching the embedder.
+    Uses the section index, falling back to a Chroma filter on the normalised
+    act_key / section_key metadata when the index file is unavailable. Returns (id, text, metadata, score) hits in
+    citation order, for `build_context`.
+    """
+    try:
+        index = resources.section_index.get()
+    except FileNotFoundError:
+        index = None
+
+    sections = []
+    for position, (act, section_no) in enumerate(citations):
+        # Earlier citations rank higher
+        score = float(len(citations) - position)
+        if index is not None:
+            for row in index.lookup(act, section_no):
+                meta = {
+                    "section_no": row.get("section_no", ""),
+                    "heading": row.get("heading", ""),
+                    "act": row.get("act", act),
+                }
+                sections.append((section_id(act, row.get("section_no", section_no)), row.get("text", ""), meta, score))
+            continue
+
+        result = resources.get_collection().get(
+            where={"$and": [
+                {"act_key": {"$eq": act_key(act)}},
+                {"section_key": {"$eq": normalize_section(section_no)}},
+            ]},
+            include=["documents", "metadatas"]
+        )
+        for uid, doc, meta in zip(result["ids"], result["documents"], result["metadatas"]):
+            sections.append((uid, doc, meta, score))
+    return sections
+
+
+def context_budget(model: str) -> int:
+    return config.CONTEXT_TOKEN_BUDGETS.get(model, config.CONTEXT_TOKEN_BUDGET)
+
+
+def lexical_search(question: str, k: int) -> list:
+    """BM25 top-k as (id, document, metadata, normalised score); empty if the index is missing."""
+    try:
+        index = resources.bm25.get()
+    except FileNotFoundError:
+        return []
+    return index.search_chunks(question, k)
+
+
+async def retrieve(question: str, query_embedding, k: int) -> list:
+    """
+    Run the retrievers selected by config.RETRIEVAL_MODE and return the
+    grounded hits as [(id, document, metadata, fused score)], best first. An empty list
+    means nothing was relevant enough to answer from the database.
+    """
+    loop = asyncio.get_event_loop()
+    mode = config.RETRIEVAL_MODE
+
+    def dense_search():
+        with stage("dense"):
+            return resources.get_retriever().search(query_embedding, k)
+
+    def timed_lexical_search():
+        with stage("lexical"):
+            return lexical_search(question, k)
+
+    # Retriever backends are synchronous, run in executor; copy_context keeps
+    # each stage's timing attached to this request
+    jobs = []
+    if mode != "lexical":
+        jobs.append(loop.run_in_executor(retrieval_executor, contextvars.copy_context().run, dense_search))
+    if mode != "dense":
+        jobs.append(loop.run_in_executor(retrieval_executor, contextvars.copy_context().run, timed_lexical_search))
+    outputs = await asyncio.gather(*jobs)
+
+    hits = {}
+    rankings = []
+    if mode != "lexical":
+        dense = outputs.pop(0)
+        # Dense hits only count when the best one clears the similarity threshold
+        if dense and dense[0][3] <= (1 - SIMILARITY_THRESHOLD):
+            for uid, doc, meta, _ in dense:
+                hits.setdefault(uid, (uid, doc, meta))
+            rankings.append([uid for uid, _, _, _ in dense])
+    if mode != "dense":
+        lexical = outputs.pop(0)
+        if lexical and lexical[0][3] >= config.BM25_MIN_SCORE:
+            for uid, doc, meta, _ in lexical:
+                hits.setdefault(uid, (uid, doc, meta))
+            rankings.append([uid for uid, _, _, _ in lexical])
+
+    fused = reciprocal_rank_fusion(rankings, k=config.RRF_K, limit=k)
+    return [(*hits[uid], score) for uid, score in fused]
+
+
+def remember(question: str, embedding, result: dict) -> dict:
+    """Store a generated answer in the answer cache and pass it through."""
+    if answer_cache is not None:
+        answer_cache.put(question, embedding, result["answer"], result["source"])
+    return result
+
+
+async def plan_answer(question: str, k: int = 5) -> dict:
+    """
+    Run every stage up to (but not including) LLM generation.
+
+    Returns either a finished answer {"answer", "source"} (cache hit or quick
+    reply), or a generation plan {"source", "model", "prompt", "section_ids",
+    "embedding"} for `query_legal_assistant` / `stream_legal_assistant`.
+    """
     loop = asyncio.get_event_loop()
 
+    # 💾 Cache level 1: the same question (modulo case/whitespace) was answered recently
+    if answer_cache is not None:
+        with stage("cache_exact"):
+            cached = answer_cache.get_exact(question)
+        CACHE_LOOKUPS.inc(level="exact", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return {"answer": cached["answer"], "source": "cache_exact"}
+
+    # ⚡ Step 0: Explicit citations ("Section 246 of IPC") skip embedding and vector search
+    citations = extract_citations(question)
+    if citations:
+        with stage("citations"):
+            cited = await loop.run_in_executor(
+                retrieval_executor, functools.partial(fetch_cited_sections, citations)
+            )
+        if cited:
+            with stage("context"):
+                context, section_ids = build_context(cited, context_budget(config.LLM_MODEL))
+            return {
+                "source": "exact_citation",
+                "model": config.LLM_MODEL,
+                "prompt": build_rag_prompt(question, context),
+                "section_ids": section_ids,
+                "embedding": None
+            }
+
     # 🧠 Step 1: Classify intent (greeting, thanks, legal_query, etc.)
-    # classify_intent uses transformers pipeline, which is synchronous.
-    intent = await loop.run_in_executor(
-        None, functools.partial(classify_intent, question)
-    )
+    # A precompiled regex, so it runs inline rather than through an executor
+    with stage("intent"):
+        intent = classify_intent(question)
 
     if intent != "legal_query":
         return {
@@ -41,70 +222,133 @@ async def query_legal_assistant(question: str, k: int = 5) -> dict:
             "source": "intent_classifier"
         }
 
-    # 🧠 Step 2: Embed and search vector DB
-    # embedder.encode is synchronous, run in executor
-    query_embedding = await loop.run_in_executor(
-        None, functools.partial(embedder.encode, question)
-    )
-    query_embedding = query_embedding.tolist()
-
-    # collection.query is synchronous, run in executor
-    results = await loop.run_in_executor(
-        None, functools.partial(
-            collection.query,
-            query_embeddings=[query_embedding],
-            n_results=k,
-            include=["documents", "distances", "metadatas"]
-        )
-    )
+    # 🧠 Step 2: Embed (batched with concurrent requests); lexical-only retrieval skips it
+    query_embedding = None
+    if config.RETRIEVAL_MODE != "lexical":
+        with stage("embed"):
+            query_embedding = await embedding_batcher.encode(question)
+
+        # 🧭 Small talk the keywords missed, judged from the same embedding
+        if intent_embedder is not None:
+            if not intent_embedder.ready:
+                await loop.run_in_executor(embed_executor, intent_embedder.build)
+            with stage("intent_embedding"):
+                intent = intent_embedder.classify(query_embedding)
+            if intent is not None and intent != "legal_query":
+                return {
+                    "answer": get_quick_reply(intent),
+                    "source": "intent_classifier"
+                }
 
-    docs = results["documents"][0]
-    distances = results["distances"][0]
-    metadatas = results["metadatas"][0]
+        # 💾 Cache level 2: a near-duplicate question, reusing the retrieval embedding
+        if answer_cache is not None:
+            with stage("cache_semantic"):
+                cached = answer_cache.get_similar(question, query_embedding)
+            CACHE_LOOKUPS.inc(level="semantic", result="miss" if cached is None else "hit")
+            if cached is not None:
+                return {"answer": cached["answer"], "source": "cache_semantic"}
+
+    # 🔎 Vector search and/or BM25, fused by reciprocal rank
+    with stage("retrieve"):
+        hits = await retrieve(question, query_embedding, k)
 
     # 🤖 Step 3: Decide if relevant enough for RAG
-    if not docs or distances[0] > (1 - SIMILARITY_THRESHOLD):
+    if not hits:
         prompt = f"""You are a helpful Indian Legal Assistant.
 
 Answer the following legal question using your general legal knowledge.
 
 Question: {question}
 Answer:"""
-        response = await loop.run_in_executor(
-            None, functools.partial(
-                ollama.chat,
-                model="llama3:8b-instruct-q4_K_M",
-                messages=[{"role": "user", "content": prompt}]
-            )
-        )
         return {
-            "answer": response["message"]["content"],
-            "source": "fallback_llm"
+            "source": "fallback_llm",
+            "model": config.LLM_FALLBACK_MODEL,
+            "prompt": prompt,
+            "section_ids": [],
+            "embedding": query_embedding
         }
 
-    # 📚 Step 4: Build context for RAG
-    context = "\n\n".join([
-        f"{m['section_no']} - {m['heading']}\n{doc}"
-        for doc, m in zip(docs, metadatas)
-    ])
+    # 📚 Step 4: Build context for RAG (merged, deduplicated, within the token budget)
+    with stage("context"):
+        context, section_ids = build_context(hits, context_budget(config.LLM_MODEL))
 
-    prompt = f"""You are a helpful Indian Legal Assistant.
-Use the following legal sections to answer the user's question:
+    return {
+        "source": "vector_db",
+        "model": config.LLM_MODEL,
+        "prompt": build_rag_prompt(question, context),
+        "section_ids": section_ids,
+        "embedding": query_embedding
+    }
 
-{context}
 
-Question: {question}
-Answer:"""
+async def generate(model: str, prompt: str) -> str:
+    """One non-streaming LLM call, admitted through the LLM gate."""
+    with stage("llm_queue"):
+        await llm_gate.acquire()
+    try:
+        with stage("llm"):
+            return await llm_client.chat(model, [{"role": "user", "content": prompt}])
+    except httpx.TimeoutException:
+        raise Overloaded(504, "The language model took too long to answer", retry_after=5)
+    finally:
+        llm_gate.release()
 
-    response = await loop.run_in_executor(
-        None, functools.partial(
-            ollama.chat,
-            model="llama3",
-            messages=[{"role": "user", "content": prompt}]
-        )
-    )
 
-    return {
-        "answer": response["message"]["content"],
-        "source": "vector_db"
-    }
+async def query_legal_assistant(question: str, k: int = 5) -> dict:
+    plan = await plan_answer(question, k)
+    ANSWERS.inc(source=plan["source"])
+    if "answer" in plan:
+        return plan
+
+    answer = await generate(plan["model"], plan["prompt"])
+
+    return remember(question, plan["embedding"], {
+        "answer": answer,
+        "source": plan["source"]
+    })
+
+
+async def stream_legal_assistant(question: str, k: int = 5):
+    """
+    Async generator of (event, data) pairs for streaming clients:
+    one "meta" event (source, retrieved section IDs), a "token" event per
+    LLM chunk, then "done" with the full answer.
+
+    Retrieval and LLM admission happen before the first event, so callers
+    can prime the generator to surface `Overloaded` as an HTTP status.
+    """
+    plan = await plan_answer(question, k)
+    ANSWERS.inc(source=plan["source"])
+
+    if "answer" in plan:
+        yield "meta", {"source": plan["source"], "section_ids": []}
+        yield "token", {"text": plan["answer"]}
+        yield "done", {"source": plan["source"], "answer": plan["answer"]}
+        return
+
+    with stage("llm_queue"):
+        await llm_gate.acquire()
+    parts = []
+    try:
+        yield "meta", {"source": plan["source"], "section_ids": plan["section_ids"]}
+
+        tokens = llm_client.stream(plan["model"], [{"role": "user", "content": plan["prompt"]}])
+        try:
+            with stage("llm"):
+                started = time.perf_counter()
+                async for text in tokens:
+                    if not parts:
+                        record_stage("llm_first_token", time.perf_counter() - started)
+                    parts.append(text)
+                    yield "token", {"text": text}
+        except httpx.TimeoutException:
+            raise Overloaded(504, "The language model stopped responding", retry_after=5)
+        finally:
+            # Closing the stream drops the HTTP request, so Ollama stops generating
+            await tokens.aclose()
+    finally:
+        llm_gate.release()
+
+    answer = "".join(parts)
+    remember(question, plan["embedding"], {"answer": answer, "source": plan["source"]})
+    yield "done", {"source": plan["source"], "answer": answer}
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import config
+from rag.logs import get_logger
+from rag.retrievers import make_retriever
+
+log = get_logger("resources")
+
+# ✅ Access shared ingest modules from the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+
+class LazyResource:
+    """A value built on first use (thread-safe) and shared by every caller afterwards."""
+
+    def __init__(self, name: str, loader):
+        self.name = name
+        self._loader = loader
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_seconds = None
+        self.error = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        with self._lock:
+            if not self._loaded:
+                start = time.perf_counter()
+                try:
+                    self._value = self._loader()
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                self.load_seconds = time.perf_counter() - start
+                self.error = None
+                self._loaded = True
+                log.info("resource loaded", extra={"fields": {
+                    "resource": self.name, "seconds": round(self.load_seconds, 3)
+                }})
+        return self._value
+
+
+def _load_embedder():
+    # Imported here so that importing the API stays cheap
+    from ingest.embedders import load_embedder
+    return load_embedder(
+        config.EMBEDDING_BACKEND, config.EMBEDDING_MODEL,
+        onnx_dir=config.EMBEDDING_ONNX_DIR, threads=config.EMBEDDING_THREADS
+    )
+
+
+def _load_chroma_client():
+    from chromadb import PersistentClient
+    return PersistentClient(path=config.CHROMA_PATH)
+
+
+def _load_bm25():
+    from ingest.bm25_index import BM25Index
+    from ingest.chunking import Chunker
+    # Chunked with the embedder's tokenizer, as rag/embed_store.py did, so that
+    # RRF fuses BM25 and Chroma IDs that point at the same text
+    chunker = Chunker.for_embedder(resources.get_embedder(), config.CHUNK_MAX_TOKENS, config.CHUNK_OVERLAP_TOKENS)
+    return BM25Index(config.BM25_SOURCE, chunker=chunker)
+
+
+def _load_section_index():
+    from api.sections import get_section_index
+    return get_section_index()
+
+
+class Resources:
+    """
+    Registry of the heavy, process-wide singletons shared by routes and tools.
+
+    Everything loads lazily on first use; `start_preload()` (called from the
+    FastAPI lifespan) preloads them in the background so `/ready` can tell
+    a load balancer when the replica is able to serve.
+    """
+
+    def __init__(self):
+        self.embedder = LazyResource("embedder", _load_embedder)
+        self.chroma = LazyResource("chroma client", _load_chroma_client)
+        self.collection = LazyResource(
+            "chroma collection", lambda: self.chroma.get().get_collection(config.CHROMA_COLLECTION)
+        )
+        self.retriever = LazyResource(
+            "vector retriever", lambda: make_retriever(config.VECTOR_BACKEND, self.get_collection)
+        )
+        self.section_index = LazyResource("section index", _load_section_index)
+        self.bm25 = LazyResource("bm25 index", _load_bm25)
+        self.started_at = time.perf_counter()
+        self.ready_seconds = None
+        self._preload = None
+
+    def get_embedder(self):
+        return self.embedder.get()
+
+    def get_collection(self):
+        return self.collection.get()
+
+    def get_retriever(self):
+        return self.retriever.get()
+
+    def _required(self):
+        if config.RETRIEVAL_MODE == "lexical":
+            return [self.bm25]
+        return [self.embedder, self.retriever]
+
+    def _optional(self):
+        if config.RETRIEVAL_MODE == "hybrid":
+            return [self.bm25, self.section_index]
+        return [self.section_index]
+
+    async def _load_all(self, executor=None):
+        loop = asyncio.get_running_loop()
+        jobs = [loop.run_in_executor(executor, r.get) for r in self._required() + self._optional()]
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        for resource, result in zip(self._required() + self._optional(), results):
+            if isinstance(result, Exception):
+                log.warning("resource load failed", extra={"fields": {
+                    "resource": resource.name, "error": repr(result)
+                }})
+        if self.ready:
+            self.ready_seconds = time.perf_counter() - self.started_at
+            log.info("backend ready", extra={"fields": {"seconds": round(self.ready_seconds, 3)}})
+
+    def start_preload(self, executor=None):
+        """Begin loading everything in the background; returns immediately."""
+        if self._preload is None:
+            self._preload = asyncio.get_running_loop().create_task(self._load_all(executor))
+        return self._preload
+
+    async def wait_ready(self):
+        if self._preload is not None:
+            await self._preload
+
+    @property
+    def ready(self) -> bool:
+        return all(r.loaded for r in self._required())
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "ready_seconds": self.ready_seconds,
+            "resources": {
+                r.name: {"loaded": r.loaded, "load_seconds": r.load_seconds, "error": r.error}
+                for r in self._required() + self._optional()
+            },
+        }
+
+
+resources = Resources()
@@ -0,0 +1,69 @@
+import os
+import sys
+
+import config
+from rag.logs import get_logger
+
+log = get_logger("retrievers")
+
+# ✅ Access shared ingest modules from the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+
+class ChromaRetriever:
+    """Dense retrieval through the Chroma collection (HNSW)."""
+
+    name = "chroma"
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def search(self, query_embedding, k: int) -> list:
+        """[(id, document, metadata, distance)], nearest first"""
+        results = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=k,
+            include=["documents", "distances", "metadatas"]
+        )
+        return list(zip(
+            results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]
+        ))
+
+
+class NumpyRetriever:
+    """Exact dense retrieval over a memory-mapped export of the collection."""
+
+    name = "numpy"
+
+    def __init__(self, store):
+        self.store = store
+
+    def search(self, query_embedding, k: int) -> list:
+        """[(id, document, metadata, distance)], nearest first"""
+        return [(*self.store.row(row), distance) for row, distance in self.store.search(query_embedding, k)]
+
+
+def load_numpy_store(path: str, get_collection):
+    """Open the NumPy store, exporting it from Chroma first if it was never built."""
+    from ingest.vector_store import NumpyVectorStore, export_collection
+
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        log.warning("numpy vector store missing, exporting", extra={"fields": {
+            "collection": config.CHROMA_COLLECTION, "path": path
+        }})
+        export_collection(
+            get_collection(), path,
+            dtype=config.NUMPY_STORE_DTYPE, quantization=config.NUMPY_STORE_QUANTIZATION
+        )
+    return NumpyVectorStore(
+        path, use_quantized=config.VECTOR_QUANTIZED, rescore=config.VECTOR_RESCORE_CANDIDATES
+    )
+
+
+def make_retriever(backend: str, get_collection):
+    """Build the dense retriever named by config.VECTOR_BACKEND."""
+    if backend == "chroma":
+        return ChromaRetriever(get_collection())
+    if backend == "numpy":
+        return NumpyRetriever(load_numpy_store(config.NUMPY_STORE_PATH, get_collection))
+    raise ValueError(f"Unknown VECTOR_BACKEND {backend!r} (expected 'chroma' or 'numpy')")
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from rag.answer_cache import AnswerCache
+
+def main():
+    # Paraphrases share one embedding here, so only the citation guard decides
+    embedding = np.ones(8, dtype=np.float32)
+    cache = AnswerCache(similarity_threshold=0.95)
+    cache.put("What does Section 302 IPC say?", embedding, "Punishment for murder", "vector_db")
+
+    checks = [
+        ("same act, other spelling", "Explain section 302 of the Indian Penal Code", "Punishment for murder"),
+        ("same section number, other act", "What does Section 302 CrPC say?", None),
+        ("other section, same act", "What does Section 304 IPC say?", None),
+        ("section without an act", "What does section 302 say?", None),
+    ]
+
+    cache.put("punishment for cheating under 420", embedding * 2, "Section 420 IPC", "vector_db")
+    checks += [
+        ("no citation, same number", "what is the punishment for cheating 420", "Section 420 IPC"),
+        ("no citation, other number", "what is the punishment for cheating 421", None),
+    ]
+
+    failed = 0
+    for name, question, expected in checks:
+        hit = cache.get_similar(question, embedding)
+        answer = hit["answer"] if hit else None
+        ok = answer == expected
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} {name}: {question!r} → {answer!r}")
+
+    # Citations survive a save/load round trip
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "answer_cache.json")
+        saved = AnswerCache(path=path)
+        saved.put("What does Section 302 IPC say?", embedding, "Punishment for murder", "vector_db")
+        saved.save()
+        loaded = AnswerCache(path=path)
+        ok = loaded.get_similar("What does Section 302 CrPC say?", embedding) is None
+        failed += not ok
+        print(f"{'✅' if ok else '❌'} reloaded cache keeps the act check")
+
+    if failed:
+        sys.exit(f"❌ {failed} answer cache checks failed")
+    print("✅ All answer cache checks passed")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 # tools/fallback_llm.py
 
-import ollama
-import asyncio
-import functools
+import httpx
 from typing import List, Dict
 
+import config
+from rag.executors import llm_gate, Overloaded
+from rag.llm_client import llm_client
+
 async def fallback_llm_response(query: str, history: List[Dict[str, str]]) -> str:
     """
     Fallback LLM with Grok-style humor and memory support.
@@ -21,13 +23,8 @@ Answer:"""
 
     messages = history + [{"role": "user", "content": prompt}]
 
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(
-        None, functools.partial(
-            ollama.chat,
-            model="llama3:8b-instruct-q4_K_M",
-            messages=messages
-        )
-    )
-
-    return response["message"]["content"]
+    async with llm_gate.slot():
+        try:
+            return await llm_client.chat(config.LLM_FALLBACK_MODEL, messages)
+        except httpx.TimeoutException:
+            raise Overloaded(504, "The language model took too long to answer", retry_after=5)
@@ -1,13 +1,10 @@
 # backend/tools/search_db.py
 
-from chromadb import PersistentClient
-
-client = PersistentClient(path="./chroma_db")
-collection = client.get_collection("legal_assistant")
+from rag.resources import resources
 
 def search_vector_db(query: str) -> list[str]:
     print(f"[Tool: search_db] Searching vector DB for: {query}")
-    result = collection.query(query_texts=[query], n_results=3)
+    result = resources.get_collection().query(query_texts=[query], n_results=3)
     return result["documents"][0] if result["documents"] else []
 
 def keyword_section_search(query: str) -> list[str]:
@@ -17,8 +14,6 @@ def keyword_section_search(query: str) -> list[str]:
         return []
 
     section_number = match.group(1)
-    section_key = f"Section {section_number}."
 
-    print(f"[Tool: search_db] Performing keyword search for: {section_key}")
-    result = collection.get(where={"section_no": {"$eq": section_key}})
-    return result["documents"] if result["documents"] else []
+    print(f"[Tool: search_db] Performing section index lookup for: Section {section_number}")
+    return [row["text"] for row in resources.section_index.get().lookup(None, section_number)]
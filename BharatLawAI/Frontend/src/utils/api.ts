@@ -3,6 +3,8 @@ export interface ChatResponse {
   source: 'vector_db' | 'fallback_llm';
 }
 
+const GROUNDED_SOURCES = ['vector_db', 'exact_citation'];
+
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://127.0.0.1:8000';
 
 export const chatWithAI = async (question: string): Promise<ChatResponse> => {
@@ -39,7 +41,8 @@ export const chatWithAI = async (question: string): Promise<ChatResponse> => {
 
     const final: ChatResponse = {
       answer: data.answer,
-      source: data.source === 'vector_db' ? 'vector_db' : 'fallback_llm',
+      // Grounded answers (vector search or an exact section citation) share the DB badge
+      source: GROUNDED_SOURCES.includes(data.source) ? 'vector_db' : 'fallback_llm',
     };
 
     console.log('✅ Final Parsed ChatResponse:', final);
@@ -0,0 +1,161 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+
+DB_FILE = "data/feedback.db"
+LEGACY_LOG = "data/feedback_log.jsonl"
+VOTES = ("thumbs_up", "thumbs_down")
+
+# ✅ Votes plus aggregates kept current by triggers, so the stats tab reads
+# a handful of pre-summed rows instead of re-scanning every vote
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id        INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    question  TEXT NOT NULL,
+    answer    TEXT NOT NULL,
+    vote      TEXT NOT NULL CHECK (vote IN ('thumbs_up', 'thumbs_down'))
+);
+CREATE INDEX IF NOT EXISTS feedback_by_time ON feedback (timestamp);
+
+CREATE TABLE IF NOT EXISTS daily_votes (
+    day   TEXT NOT NULL,
+    vote  TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, vote)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS question_votes (
+    question TEXT PRIMARY KEY,
+    up       INTEGER NOT NULL,
+    down     INTEGER NOT NULL,
+    last_at  TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS feedback_aggregates AFTER INSERT ON feedback
+BEGIN
+    INSERT INTO daily_votes (day, vote, count) VALUES (substr(NEW.timestamp, 1, 10), NEW.vote, 1)
+        ON CONFLICT (day, vote) DO UPDATE SET count = count + 1;
+    INSERT INTO question_votes (question, up, down, last_at)
+        VALUES (NEW.question, NEW.vote = 'thumbs_up', NEW.vote = 'thumbs_down', NEW.timestamp)
+        ON CONFLICT (question) DO UPDATE SET
+            up = up + (NEW.vote = 'thumbs_up'),
+            down = down + (NEW.vote = 'thumbs_down'),
+            last_at = max(last_at, NEW.timestamp);
+END;
+"""
+
+class FeedbackStore:
+    """
+    Feedback votes in SQLite (WAL, so the stats tab can read while a vote is
+    written). Each vote is one indexed insert; triggers keep the daily and
+    per-question aggregates current in the same transaction.
+    """
+
+    def __init__(self, path=DB_FILE, legacy_log=LEGACY_LOG):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        # Streamlit reruns on different threads; writes are serialised by the lock
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        if legacy_log:
+            self.migrate_jsonl(legacy_log)
+
+    def record(self, timestamp, question, answer, vote):
+        if vote not in VOTES:
+            raise ValueError(f"Unknown vote {vote!r}")
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO feedback (timestamp, question, answer, vote) VALUES (?, ?, ?, ?)",
+                (timestamp, question, answer, vote)
+            )
+
+    def migrate_jsonl(self, log_path):
+        """One-time import of the old feedback_log.jsonl; returns the number of votes imported"""
+        key = f"migrated:{os.path.abspath(log_path)}"
+        if not os.path.exists(log_path) or self._meta(key) is not None:
+            return 0
+
+        rows = []
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a torn final line from an interrupted append
+                if record.get("feedback") in VOTES:
+                    rows.append((record.get("timestamp", ""), record.get("question", ""),
+                                 record.get("answer", ""), record["feedback"]))
+
+        with self._lock, self._db:
+            self._db.executemany("INSERT INTO feedback (timestamp, question, answer, vote) VALUES (?, ?, ?, ?)", rows)
+            self._db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(len(rows))))
+        print(f"📥 Migrated {len(rows)} votes from {log_path} to {self.path}")
+        return len(rows)
+
+    def _meta(self, key):
+        row = self._query("SELECT value FROM meta WHERE key = ?", (key,))
+        return row[0][0] if row else None
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # 📊 Reads for the stats tab: all served from the aggregate tables or the time index
+
+    def totals(self):
+        counts = dict(self._query("SELECT vote, SUM(count) FROM daily_votes GROUP BY vote"))
+        return {vote: counts.get(vote, 0) for vote in VOTES}
+
+    def daily(self):
+        """[(day, vote, count)] in date order"""
+        return self._query("SELECT day, vote, count FROM daily_votes ORDER BY day, vote")
+
+    def controversial(self, limit=100):
+        """[(question, up, down)] for questions with both 👍 and 👎, most voted first"""
+        return self._query(
+            "SELECT question, up, down FROM question_votes WHERE up > 0 AND down > 0 "
+            "ORDER BY up + down DESC, last_at DESC LIMIT ?", (limit,)
+        )
+
+    def recent(self, limit=200):
+        """[(timestamp, question, vote)] newest first"""
+        return self._query(
+            "SELECT timestamp, question, vote FROM feedback ORDER BY timestamp DESC LIMIT ?", (limit,)
+        )
+
+    def close(self):
+        self._db.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """The process-wide store, opened (and the old JSONL log migrated) on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FeedbackStore()
+        return _store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import feedback_log.jsonl into the SQLite feedback store")
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--log", default=LEGACY_LOG)
+    args = parser.parse_args()
+    store = FeedbackStore(args.db, legacy_log=None)
+    if not store.migrate_jsonl(args.log):
+        print(f"ℹ️ Nothing to migrate from {args.log} (missing or already imported)")
+    print(f"📊 Totals: {store.totals()}")
@@ -1,20 +1,17 @@
 import streamlit as st
-import sys, os, json, time
+import sys, os
 from datetime import datetime
 
 # ✅ Access root project modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-from rag.query_engine import query_legal_assistant
+from rag.query_engine import stream_legal_assistant, load_embedding_model, load_collection
+from feedback_store import get_store
+from tabs.stats import load_feedback_stats
 
-# ✅ Typing animation
-def typing_effect(text, delay=0.01):
-    full = ""
-    placeholder = st.empty()
-    for char in text:
-        full += char
-        placeholder.markdown(full + "▌")
-        time.sleep(delay)
-    placeholder.markdown(full)
+# ✅ Embedder and Chroma collection load once per Streamlit process, not per rerun or session
+@st.cache_resource(show_spinner="📦 Loading the embedding model and legal sections...")
+def load_engine():
+    return load_embedding_model(), load_collection()
 
 def render():
     st.title("⚖️ AI Indian Legal Assistant")
@@ -31,16 +28,22 @@ def render():
             st.session_state["feedback"] = None
             st.session_state["timestamp"] = datetime.now().isoformat()
 
-    # ✅ Run model only if flagged
+    # ✅ Run model only if flagged, streaming tokens as the LLM produces them
     if st.session_state.get("generate"):
+        embedder, collection = load_engine()
+        st.markdown("#### 🤖 Assistant:")
         with st.spinner("🤖 Thinking..."):
-            st.session_state["answer"] = query_legal_assistant(st.session_state["question"])
-            st.session_state["generate"] = False
+            st.session_state["answer"] = st.write_stream(
+                stream_legal_assistant(st.session_state["question"], embedder=embedder, collection=collection)
+            )
+        st.session_state["generate"] = False
 
-    # ✅ Show answer if available
-    if "answer" in st.session_state:
+    # ✅ Later reruns (feedback clicks) just show the finished answer
+    elif "answer" in st.session_state:
         st.markdown("#### 🤖 Assistant:")
-        typing_effect(st.session_state["answer"], delay=0.005)
+        st.markdown(st.session_state["answer"])
+
+    if "answer" in st.session_state:
 
         st.divider()
         st.subheader("📨 User Feedback")
@@ -55,20 +58,17 @@ def render():
         with col3:
             if st.button("🔁 Regenerate"):
                 st.session_state["generate"] = True
-                st.experimental_rerun()
+                st.rerun()
 
-        # ✅ Save feedback to file
+        # ✅ Save feedback (one SQLite insert; aggregates update with it)
         if st.session_state.get("feedback"):
-            feedback_record = {
-                "timestamp": st.session_state["timestamp"],
-                "question": st.session_state.get("question", ""),
-                "answer": st.session_state.get("answer", ""),
-                "feedback": st.session_state["feedback"]
-            }
-
-            os.makedirs("data", exist_ok=True)
-            with open("data/feedback_log.jsonl", "a", encoding="utf-8") as f:
-                f.write(json.dumps(feedback_record) + "\n")
+            get_store().record(
+                timestamp=st.session_state["timestamp"],
+                question=st.session_state.get("question", ""),
+                answer=st.session_state.get("answer", ""),
+                vote=st.session_state["feedback"]
+            )
+            load_feedback_stats.clear()  # the stats tab shows the new vote on its next run
 
             st.success(f"✅ Feedback recorded: {st.session_state['feedback']}")
             st.session_state["feedback"] = None
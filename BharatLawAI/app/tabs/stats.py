@@ -1,41 +1,40 @@
 import streamlit as st
 import pandas as pd
-import json
-import os
-from collections import Counter
 import plotly.express as px
 
+from feedback_store import get_store
+
+# ✅ Reruns reuse the last read; a new vote clears it (see tabs/chat.py)
+@st.cache_data(ttl=60)
+def load_feedback_stats():
+    """Every query reads the pre-aggregated tables or the time index, not the full vote log"""
+    store = get_store()
+    return {
+        "totals": store.totals(),
+        "controversial": store.controversial(),
+        "daily": store.daily(),
+        "recent": store.recent(limit=500),
+    }
+
 def render():
     st.title("📊 Feedback Analytics & Monitoring")
 
-    log_file = "data/feedback_log.jsonl"
+    data = load_feedback_stats()
+    totals = data["totals"]
 
-    if not os.path.exists(log_file) or os.path.getsize(log_file) == 0:
+    if not any(totals.values()):
         st.warning("No feedback found yet. Ask some questions and submit votes first.")
         return
 
-    with open(log_file, "r", encoding="utf-8") as f:
-        feedback_data = [json.loads(line) for line in f if line.strip()]
-
-    df = pd.DataFrame(feedback_data)
-
     # ✅ Summary stats
     st.subheader("✅ Feedback Summary")
-    up_count = (df["feedback"] == "thumbs_up").sum()
-    down_count = (df["feedback"] == "thumbs_down").sum()
-
     col1, col2 = st.columns(2)
-    col1.metric("👍 Thumbs-Up", up_count)
-    col2.metric("👎 Thumbs-Down", down_count)
+    col1.metric("👍 Thumbs-Up", totals["thumbs_up"])
+    col2.metric("👎 Thumbs-Down", totals["thumbs_down"])
 
     # 🔥 Controversial questions (got both 👍 and 👎)
     st.subheader("🔥 Controversial Questions")
-    controversial = (
-        df.groupby("question")["feedback"]
-        .nunique()
-        .reset_index()
-        .query("feedback > 1")
-    )
+    controversial = pd.DataFrame(data["controversial"], columns=["question", "thumbs_up", "thumbs_down"])
 
     if controversial.empty:
         st.info("No controversial questions yet.")
@@ -44,8 +43,7 @@ def render():
 
     # 📅 Daily vote trends
     st.subheader("📅 Daily Voting Trends")
-    df["date"] = pd.to_datetime(df["timestamp"]).dt.date
-    vote_counts = df.groupby(["date", "feedback"]).size().reset_index(name="count")
+    vote_counts = pd.DataFrame(data["daily"], columns=["date", "feedback", "count"])
 
     fig = px.line(
         vote_counts,
@@ -58,6 +56,6 @@ def render():
     fig.update_layout(height=400)
     st.plotly_chart(fig, use_container_width=True)
 
-    # 📝 Full feedback table
-    st.subheader("📝 Full Feedback Log")
-    st.dataframe(df.sort_values(by="timestamp", ascending=False)[["timestamp", "question", "feedback"]])
+    # 📝 Latest feedback (newest first, served by the timestamp index)
+    st.subheader("📝 Recent Feedback")
+    st.dataframe(pd.DataFrame(data["recent"], columns=["timestamp", "question", "feedback"]))
@@ -0,0 +1,274 @@
+# ingest/bm25_index.py
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+DATA_FILE = Path("data/parsed_acts.jsonl")
+INDEX_VERSION = 3
+
+# Stop words carry no signal for statute lookup; section numbers and rare terms do
+STOP_WORDS = frozenset("""
+a an and any are as at be by for from has have if in into is it its of on or such
+that the their then there these this to was were which who whom will with what how
+does do can under shall may
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SECTION_SUFFIX = re.compile(r"\b(\d+)\s*-\s*([a-z]{1,2})\b")
+
+def tokenize(text):
+    """Lowercase word/number tokens; "498-A" and "498A" both become "498a"."""
+    text = _SECTION_SUFFIX.sub(r"\1\2", text.lower())
+    return [t for t in _TOKEN.findall(text) if t not in STOP_WORDS]
+
+def bm25_path_for(jsonl_path):
+    jsonl_path = Path(jsonl_path)
+    return jsonl_path.with_name(jsonl_path.name + ".bm25.npz")
+
+def _file_version(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def build_bm25_index(jsonl_path=DATA_FILE, index_path=None, chunker=None):
+    """
+    Build a BM25 inverted index over the same chunks that rag/embed_store.py
+    writes to Chroma and save it as compressed-sparse-row numpy arrays:
+
+        term_ptr[t]:term_ptr[t+1]   slice of doc_ids / tfs holding term t's postings
+        doc_len, record_offset,     one entry per chunk; chunk text and metadata
+        record_length, chunk_index, are re-read from the JSONL only for hits, cut
+        span_start, span_end,       at the stored character span
+        occurrence
+
+    Pass the `chunker` the embeddings were built with, so chunk IDs and texts
+    match Chroma's; spans mean the index is read back without a tokenizer.
+    """
+    from ingest.chunking import Chunker, Occurrences, make_chunk
+
+    chunker = chunker or Chunker()
+    occurrences = Occurrences()
+
+    jsonl_path = Path(jsonl_path)
+    index_path = Path(index_path) if index_path else bm25_path_for(jsonl_path)
+
+    vocab = {}
+    postings = []  # per term: [doc, tf, doc, tf, ...]
+    doc_len, record_offset, record_length, chunk_index = [], [], [], []
+    span_start, span_end, occurrence = [], [], []
+
+    offset = 0
+    with open(jsonl_path, "rb") as f:
+        for raw in f:
+            length = len(raw)
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                offset += length
+                continue
+            repeat = occurrences.next(record)
+            for idx, (start, end) in enumerate(chunker.spans(record)):
+                _, chunk, _ = make_chunk(record, idx, start, end, repeat)
+                doc = len(doc_len)
+                # The chunk's context line makes act, section number and heading searchable
+                tokens = tokenize(chunk)
+                counts = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+                for token, tf in counts.items():
+                    term = vocab.setdefault(token, len(vocab))
+                    if term == len(postings):
+                        postings.append([])
+                    postings[term].extend((doc, tf))
+                doc_len.append(len(tokens))
+                record_offset.append(offset)
+                record_length.append(length)
+                chunk_index.append(idx)
+                span_start.append(start)
+                span_end.append(end)
+                occurrence.append(repeat)
+            offset += length
+
+    term_ptr = np.zeros(len(postings) + 1, dtype=np.int64)
+    term_ptr[1:] = np.cumsum([len(p) // 2 for p in postings])
+    flat = np.fromiter((x for p in postings for x in p), dtype=np.int64, count=int(term_ptr[-1]) * 2)
+    terms = sorted(vocab, key=vocab.get)
+
+    tmp_path = index_path.with_name(index_path.name + ".tmp.npz")
+    np.savez(
+        tmp_path,
+        meta=np.frombuffer(json.dumps({
+            "version": INDEX_VERSION,
+            "source": _file_version(jsonl_path),
+            "chunker": chunker.spec(),
+        }).encode(), dtype=np.uint8),
+        terms=np.frombuffer("\n".join(terms).encode("utf-8"), dtype=np.uint8),
+        term_ptr=term_ptr,
+        doc_ids=flat[0::2].astype(np.int32),
+        tfs=np.minimum(flat[1::2], np.iinfo(np.uint16).max).astype(np.uint16),
+        doc_len=np.asarray(doc_len, dtype=np.int32),
+        record_offset=np.asarray(record_offset, dtype=np.int64),
+        record_length=np.asarray(record_length, dtype=np.int32),
+        chunk_index=np.asarray(chunk_index, dtype=np.int32),
+        span_start=np.asarray(span_start, dtype=np.int32),
+        span_end=np.asarray(span_end, dtype=np.int32),
+        occurrence=np.asarray(occurrence, dtype=np.int32),
+    )
+    os.replace(tmp_path, index_path)
+
+    print(f"🔤 BM25 indexed {len(doc_len)} chunks, {len(terms)} terms → {index_path}")
+    return index_path
+
+class BM25Index:
+    """
+    Okapi BM25 over parsed_acts.jsonl chunks.
+
+    Postings are numpy CSR arrays, so a query is one vectorised
+    scatter-add per query term plus an argpartition for the top k.
+
+    Hit records are read with seek-and-read rather than mmap, so a JSONL
+    truncated by a re-ingest cannot kill the process with SIGBUS. When the
+    JSONL changes on disk, the next search reloads (or rebuilds) the index.
+    """
+
+    def __init__(self, jsonl_path=DATA_FILE, index_path=None, k1=1.2, b=0.75, chunker=None):
+        self.jsonl_path = Path(jsonl_path)
+        self.index_path = Path(index_path) if index_path else bm25_path_for(self.jsonl_path)
+        self.k1 = k1
+        self.b = b
+        # The chunker the Chroma collection was built with; an index built with
+        # another chunker is stale, since its chunk IDs point at different text
+        self.chunker = chunker
+        # Serialises reloads and seek + read on the shared handle across retrieval threads
+        self._lock = threading.RLock()
+        self._file = None
+        self._open()
+
+    def _open(self):
+        k1, b = self.k1, self.b
+        data = self._load()
+        if data is None:
+            if self.chunker is None:
+                # Without the embedder's tokenizer chunk boundaries can differ from Chroma's
+                print(f"⚠️ BM25 index missing or stale, rebuilding {self.index_path} with estimated token counts")
+            else:
+                print(f"⚠️ BM25 index missing or stale, rebuilding {self.index_path} with chunker {self.chunker.spec()}")
+            build_bm25_index(self.jsonl_path, self.index_path, chunker=self.chunker)
+            data = self._load()
+
+        self.vocab = {term: i for i, term in enumerate(bytes(data["terms"]).decode("utf-8").split("\n"))}
+        self.term_ptr = data["term_ptr"]
+        self.doc_ids = data["doc_ids"]
+        self.tfs = data["tfs"].astype(np.float32)
+        self.record_offset = data["record_offset"]
+        self.record_length = data["record_length"]
+        self.chunk_index = data["chunk_index"]
+        self.span_start = data["span_start"]
+        self.span_end = data["span_end"]
+        self.occurrence = data["occurrence"]
+
+        doc_len = data["doc_len"].astype(np.float32)
+        self.num_docs = len(doc_len)
+        avg_len = float(doc_len.mean()) if self.num_docs else 0.0
+        # Length normalisation per chunk, precomputed once: k1 * (1 - b + b * |d| / avgdl)
+        self._norm = (k1 * (1 - b + b * doc_len / avg_len)).astype(np.float32) if avg_len else doc_len
+        self._version = json.loads(bytes(data["meta"]).decode())["source"]
+
+        previous, self._file = self._file, open(self.jsonl_path, "rb")
+        if previous is not None:
+            previous.close()
+
+    def _load(self):
+        if not self.index_path.exists():
+            return None
+        data = np.load(self.index_path)
+        meta = json.loads(bytes(data["meta"]).decode())
+        if meta.get("version") != INDEX_VERSION or meta.get("source") != _file_version(self.jsonl_path):
+            return None
+        if self.chunker is not None and meta.get("chunker") != self.chunker.spec():
+            return None
+        return data
+
+    def _refresh(self):
+        """Reload if parsed_acts.jsonl changed since the index was loaded"""
+        try:
+            changed = _file_version(self.jsonl_path) != self._version
+        except FileNotFoundError:
+            return  # mid-replace; keep serving the file that is already open
+        if changed:
+            print(f"♻️ {self.jsonl_path} changed on disk, reloading the BM25 index")
+            self._open()
+
+    def idf(self, term):
+        df = int(self.term_ptr[term + 1] - self.term_ptr[term])
+        return math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k=5):
+        """
+        Return [(chunk, score, normalised score)] for the top `k` chunks.
+        The normalised score divides by the score of an average-length chunk
+        containing every query term once (capped at 1), a corpus-independent
+        relevance cue for deciding whether the hits can ground an answer.
+        """
+        with self._lock:
+            self._refresh()
+            return self._search(query, k)
+
+    def search_chunks(self, query, k=5):
+        """
+        [(id, chunk text, metadata, normalised score)] for the top `k` chunks,
+        scored and read from the same version of the index
+        """
+        with self._lock:
+            self._refresh()
+            return [(*self.chunk(doc), normalised) for doc, _, normalised in self._search(query, k)]
+
+    def _search(self, query, k):
+        terms = [self.vocab[t] for t in dict.fromkeys(tokenize(query)) if t in self.vocab]
+        # Terms in most chunks ("section", "act") only add noise to ranking and the relevance cue
+        terms = [t for t in terms if 2 * (self.term_ptr[t + 1] - self.term_ptr[t]) <= self.num_docs]
+        if not terms or not self.num_docs:
+            return []
+
+        scores = np.zeros(self.num_docs, dtype=np.float32)
+        ceiling = 0.0
+        for term in terms:
+            start, end = self.term_ptr[term], self.term_ptr[term + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.tfs[start:end]
+            idf = self.idf(term)
+            # A term appears once per chunk in its postings, so plain fancy-index += is safe
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + self._norm[docs])
+            ceiling += idf
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(doc), float(scores[doc]), min(1.0, float(scores[doc]) / ceiling)) for doc in top]
+
+    def chunk(self, doc):
+        """(id, chunk text, metadata) for chunk number `doc`"""
+        from ingest.chunking import make_chunk
+
+        offset, length = int(self.record_offset[doc]), int(self.record_length[doc])
+        with self._lock:
+            self._file.seek(offset)
+            record = json.loads(self._file.read(length))
+        return make_chunk(record, int(self.chunk_index[doc]), int(self.span_start[doc]), int(self.span_end[doc]),
+                          int(self.occurrence[doc]))
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+if __name__ == "__main__":
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    build_bm25_index(sys.argv[1] if len(sys.argv) > 1 else DATA_FILE)
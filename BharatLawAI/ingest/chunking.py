@@ -0,0 +1,231 @@
+# ingest/chunking.py
+
+import json
+import re
+from collections import Counter
+
+import numpy as np
+
+SPECIAL_TOKENS = 2  # [CLS] ... [SEP] added by the embedder
+WORDS_PER_TOKEN = 0.75  # estimate when no tokenizer is available
+
+# Units never split across chunks unless a single one is over budget:
+# sentences, "; " clauses, and legal sub-divisions such as "(1)", "(a)", "(iv)",
+# "Explanation", "Illustration", "Provided that", "Exception"
+_BOUNDARY = re.compile(
+    r"(?<=[.;:—])\s+"
+    r"|\s+(?=\(\d{1,3}[A-Z]?\)\s|\([a-z]{1,4}\)\s|Explanation\b|Illustrations?\b|Provided\s+(?:further\s+)?that\b|Exception\b)"
+)
+_WORD = re.compile(r"\S+")
+
+# Context line prepended to every chunk: "[Act | Section 302. Punishment for murder]"
+_CONTEXT_LINE = re.compile(r"^\[[^\]\n]*\]\n")
+
+def record_key(act, section_no):
+    """`{act}_{section}` prefix of a record's chunk IDs"""
+    act = act.replace(" ", "_")
+    section = re.sub(r"[^\w]", "", section_no)  # clean section_no
+    return f"{act}_{section}"
+
+def chunk_id(act, section_no, idx, occurrence=0):
+    """
+    Stable `{act}_{section}_{idx}` ID shared by Chroma, BM25 and the answer metadata.
+    The n-th repeat of the same (act, section) in the input gets `{act}_{section}~{n}_{idx}`.
+    """
+    key = record_key(act, section_no)
+    return f"{key}~{occurrence}_{idx}" if occurrence else f"{key}_{idx}"
+
+class Occurrences:
+    """Numbers repeated (act, section) records in input order, so their chunk IDs stay distinct"""
+
+    def __init__(self):
+        self._seen = Counter()
+
+    def next(self, record):
+        key = record_key(record.get("act", "UNKNOWN_ACT"), record.get("section_no", ""))
+        occurrence = self._seen[key]
+        self._seen[key] += 1
+        return occurrence
+
+def context_line(record):
+    act = record.get("act", "UNKNOWN_ACT")
+    title = " ".join(p for p in (record.get("section_no", ""), record.get("heading", "")) if p)
+    return f"[{act} | {title}]"
+
+def strip_context(document):
+    """Chunk text without the leading context line"""
+    return _CONTEXT_LINE.sub("", document, count=1)
+
+class TokenCounter:
+    """
+    Token counts from the embedder's own tokenizer: a Hugging Face tokenizer
+    (TorchEmbedder.tokenizer), a `tokenizers.Tokenizer` (OnnxEmbedder.tokenizer),
+    or None for a words-based estimate.
+    """
+
+    def __init__(self, tokenizer=None):
+        if hasattr(tokenizer, "encode_batch"):
+            # The embedder's copy pads and truncates batches; counting needs raw lengths
+            from tokenizers import Tokenizer
+            tokenizer = Tokenizer.from_str(tokenizer.to_str())
+            tokenizer.no_padding()
+            tokenizer.no_truncation()
+        self.tokenizer = tokenizer
+
+    def counts(self, texts):
+        if not texts:
+            return []
+        if self.tokenizer is None:
+            return [int(len(t.split()) / WORDS_PER_TOKEN + 0.5) for t in texts]
+        if hasattr(self.tokenizer, "encode_batch"):
+            return [len(e.ids) for e in self.tokenizer.encode_batch(texts, add_special_tokens=False)]
+        return [len(ids) for ids in self.tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+class Chunker:
+    """
+    Split section text into chunks that fit the embedder's sequence length.
+
+    Text is cut into clause-level units first; units are packed greedily up
+    to `max_tokens` (including the context line and special tokens) and each
+    new chunk repeats up to `overlap_tokens` of trailing units from the one
+    before. A unit longer than a whole chunk is split between words.
+    """
+
+    def __init__(self, tokenizer=None, max_tokens=512, overlap_tokens=32, tokenizer_name=None):
+        self.counter = tokenizer if isinstance(tokenizer, TokenCounter) else TokenCounter(tokenizer)
+        # Recorded in spec(), so an index chunked with word estimates is not mistaken for a tokenizer-built one
+        self.tokenizer_name = tokenizer_name or ("words" if self.counter.tokenizer is None else "custom")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.stats = ChunkStats(max_tokens)
+
+    @classmethod
+    def for_embedder(cls, embedder, max_tokens=0, overlap_tokens=32):
+        """Chunker measuring with `embedder`'s tokenizer; max_tokens=0 means its max_seq_length"""
+        limit = embedder.max_seq_length
+        return cls(embedder.tokenizer, min(max_tokens, limit) if max_tokens else limit, overlap_tokens,
+                   tokenizer_name=embedder.model_name)
+
+    def spec(self):
+        return {"tokenizer": self.tokenizer_name, "max_tokens": self.max_tokens, "overlap_tokens": self.overlap_tokens}
+
+    def _units(self, text):
+        units, start = [], 0
+        for match in _BOUNDARY.finditer(text):
+            if match.start() > start:
+                units.append((start, match.start()))
+            start = match.end()
+        if start < len(text.rstrip()):
+            units.append((start, len(text.rstrip())))
+        return units
+
+    def _split_long(self, text, start, end, budget):
+        """Word-level pieces of one oversized unit, each within `budget` tokens"""
+        words = [(start + m.start(), start + m.end()) for m in _WORD.finditer(text[start:end])]
+        counts = self.counter.counts([text[s:e] for s, e in words])
+        pieces, piece_start, size = [], None, 0
+        for (s, e), n in zip(words, counts):
+            if piece_start is not None and size + n > budget:
+                pieces.append((piece_start, last_end, size))
+                piece_start, size = None, 0
+            if piece_start is None:
+                piece_start = s
+            size += n
+            last_end = e
+        if piece_start is not None:
+            pieces.append((piece_start, last_end, size))
+        return pieces
+
+    def spans(self, record):
+        """(start, end) character spans of `record["text"]`, one per chunk"""
+        text = record.get("text") or ""
+        units = self._units(text)
+        if not units:
+            return []
+
+        header_tokens = self.counter.counts([context_line(record)])[0] + 1
+        budget = max(16, self.max_tokens - SPECIAL_TOKENS - header_tokens)
+
+        sized = []
+        for (s, e), n in zip(units, self.counter.counts([text[s:e] for s, e in units])):
+            sized.extend(self._split_long(text, s, e, budget) if n > budget else [(s, e, n)])
+
+        chunks, current, size = [], [], 0
+        for unit in sized:
+            if current and size + unit[2] > budget:
+                chunks.append(current)
+                # Carry trailing units as overlap, never the whole previous chunk
+                tail, carried = [], 0
+                for previous in reversed(current[1:]):
+                    if carried + previous[2] > self.overlap_tokens or carried + previous[2] + unit[2] > budget:
+                        break
+                    tail.insert(0, previous)
+                    carried += previous[2]
+                current, size = tail, carried
+            current.append(unit)
+            size += unit[2]
+        if current:
+            chunks.append(current)
+
+        for chunk in chunks:
+            self.stats.add(header_tokens + SPECIAL_TOKENS + sum(u[2] for u in chunk))
+        return [(chunk[0][0], chunk[-1][1]) for chunk in chunks]
+
+def make_chunk(record, idx, start, end, occurrence=0):
+    """(id, chunk, metadata) for the `idx`-th chunk: the context line, then text[start:end]"""
+    from ingest.section_index import act_key, normalize_section
+
+    act = record.get("act", "UNKNOWN_ACT")
+    section_no = record.get("section_no", "")
+    metadata = {
+        "section_no": section_no,
+        "heading": record.get("heading", ""),
+        "part": record.get("part", ""),
+        "act": act,
+        # Normalised keys for exact (act, section) metadata filters
+        "act_key": act_key(act),
+        "section_key": normalize_section(section_no),
+        "chunk_index": idx
+    }
+    text = (record.get("text") or "")[start:end]
+    return chunk_id(act, section_no, idx, occurrence), f"{context_line(record)}\n{text}", metadata
+
+def record_chunks(record, chunker=None, occurrence=0):
+    """(id, chunk, metadata) for every chunk of one parsed_acts.jsonl record"""
+    for idx, (start, end) in enumerate((chunker or Chunker()).spans(record)):
+        yield make_chunk(record, idx, start, end, occurrence)
+
+def iter_chunks(path, chunker=None):
+    """Stream (id, chunk, metadata) items from the parsed legal sections"""
+    chunker = chunker or Chunker()
+    occurrences = Occurrences()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            yield from record_chunks(record, chunker, occurrences.next(record))
+
+class ChunkStats:
+    """Running chunk-length distribution, in tokens, for tuning chunk size against recall"""
+
+    def __init__(self, max_tokens):
+        self.max_tokens = max_tokens
+        self.lengths = []
+
+    def add(self, tokens):
+        self.lengths.append(tokens)
+
+    def report(self):
+        if not self.lengths:
+            print("📏 No chunks produced")
+            return
+        lengths = np.asarray(self.lengths)
+        p50, p90, p99 = np.percentile(lengths, [50, 90, 99])
+        print(f"📏 {len(lengths)} chunks, tokens incl. context (max {self.max_tokens}): "
+              f"mean {lengths.mean():.0f} | p50 {p50:.0f} | p90 {p90:.0f} | p99 {p99:.0f} | max {lengths.max()}")
+        print(f"   ≥90% of max: {np.mean(lengths >= 0.9 * self.max_tokens):.1%} | "
+              f"<25% of max: {np.mean(lengths < 0.25 * self.max_tokens):.1%}")
+        edges = np.linspace(0, self.max_tokens, 9)
+        counts, _ = np.histogram(np.minimum(lengths, self.max_tokens), bins=edges)
+        for low, high, count in zip(edges[:-1], edges[1:], counts):
+            bar = "█" * int(40 * count / max(counts.max(), 1))
+            print(f"   {low:4.0f}-{high:<4.0f} {count:7d} {bar}")
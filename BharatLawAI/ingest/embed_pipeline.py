@@ -0,0 +1,112 @@
+# ingest/embed_pipeline.py
+
+import time
+from itertools import islice
+
+from tqdm import tqdm
+
+from ingest.index_manifest import content_hash, embedder_fingerprint
+
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items from `iterable` without materialising it"""
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def embed_and_write(items, model, collection, batch_size=64, write_batch=1024, workers=0,
+                    manifest=None, desc="🔁 Embedding & Storing"):
+    """
+    Embed a stream of (id, document, metadata) items and write them to Chroma.
+
+    Items are grouped into write batches of `write_batch` chunks. Each group is
+    encoded with one `SentenceTransformer.encode` call (split into `batch_size`
+    forward passes) and stored with a single `collection.upsert`. With
+    `workers > 1` the encoding is spread over a sentence-transformers
+    multi-process pool.
+
+    An ID seen earlier in the stream is skipped with a warning (one upsert
+    batch must not repeat an ID, and a later duplicate would overwrite the
+    first). When an `IndexManifest` is given, chunks whose content hash is unchanged are
+    skipped, every written batch is checkpointed, and chunks that no longer
+    appear in the stream are deleted once the whole stream has been consumed.
+    The hash covers the embedder's model and backend, so switching either
+    re-embeds every chunk.
+
+    Returns (chunks written, chunks/sec).
+    """
+    seen = set()
+    skipped = duplicates = 0
+    fingerprint = embedder_fingerprint(model)
+    if manifest is not None:
+        manifest.embedder = fingerprint
+
+    def pending():
+        nonlocal skipped, duplicates
+        for uid, doc, metadata in items:
+            if uid in seen:
+                duplicates += 1
+                continue
+            seen.add(uid)
+            if manifest is None:
+                yield uid, doc, metadata, None
+                continue
+            digest = content_hash(doc, metadata, fingerprint)
+            if manifest.is_current(uid, digest):
+                skipped += 1
+                continue
+            yield uid, doc, metadata, digest
+
+    pool = None
+    if workers > 1 and hasattr(model, "start_multi_process_pool"):
+        pool = model.start_multi_process_pool(target_devices=["cpu"] * workers)
+    elif workers > 1:
+        print("⚠️ This embedder runs in-process; use its thread settings instead of --workers")
+
+    total = 0
+    start = time.perf_counter()
+    try:
+        with tqdm(desc=desc, unit="chunk") as bar:
+            for batch in batched(pending(), write_batch):
+                ids, docs, metadatas, digests = (list(col) for col in zip(*batch))
+
+                if pool is not None:
+                    embeddings = model.encode_multi_process(docs, pool, batch_size=batch_size)
+                else:
+                    embeddings = model.encode(docs, batch_size=batch_size, show_progress_bar=False)
+
+                collection.upsert(
+                    ids=ids,
+                    documents=docs,
+                    metadatas=metadatas,
+                    embeddings=embeddings.tolist()
+                )
+                if manifest is not None:
+                    manifest.record(ids, digests)
+
+                total += len(batch)
+                bar.update(len(batch))
+                bar.set_postfix(rate=f"{total / (time.perf_counter() - start):.1f}/s")
+    finally:
+        if pool is not None:
+            model.stop_multi_process_pool(pool)
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"⚡ Embedded {total} chunks in {elapsed:.1f}s ({rate:.1f} chunks/sec)")
+    if duplicates:
+        print(f"⚠️ Skipped {duplicates} chunks whose ID was already used earlier in the input")
+
+    if manifest is not None:
+        stale = [uid for uid in manifest.hashes if uid not in seen]
+        for ids in batched(stale, write_batch):
+            collection.delete(ids=ids)
+            manifest.forget(ids)
+        manifest.save()
+        print(f"♻️ Unchanged: {skipped} | Deleted: {len(stale)} | Indexed: {len(manifest)}")
+
+    return total, rate
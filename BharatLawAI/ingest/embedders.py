@@ -0,0 +1,208 @@
+# ingest/embedders.py
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_META = "embedder.json"
+
+def default_onnx_dir(model_name):
+    """./models/<model>-onnx, shared by the ingest scripts and the backend"""
+    return os.path.join("models", model_name.replace("/", "_") + "-onnx")
+
+class TorchEmbedder:
+    """The reference sentence-transformers model (PyTorch)."""
+
+    backend = "torch"
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.max_seq_length = self.model.max_seq_length
+        self.tokenizer = self.model.tokenizer
+
+    @property
+    def dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        return self.model.encode(texts, batch_size=batch_size, show_progress_bar=show_progress_bar, **kwargs)
+
+    # Multi-process encoding for large ingests (see ingest/embed_pipeline.py)
+    def start_multi_process_pool(self, *args, **kwargs):
+        return self.model.start_multi_process_pool(*args, **kwargs)
+
+    def encode_multi_process(self, *args, **kwargs):
+        return self.model.encode_multi_process(*args, **kwargs)
+
+    def stop_multi_process_pool(self, pool):
+        return self.model.stop_multi_process_pool(pool)
+
+def _pooling_mode(pooling):
+    """"cls" or "mean" from a sentence-transformers Pooling module (old and new config layouts)"""
+    if pooling is None:
+        return "mean"
+    config = pooling.get_config_dict()
+    mode = config.get("pooling_mode")
+    if mode is None:
+        mode = "cls" if config.get("pooling_mode_cls_token") else "mean"
+    if mode not in ("cls", "mean"):
+        raise ValueError(f"Pooling mode {mode!r} is not supported by the ONNX embedder")
+    return mode
+
+def export_onnx(model_name, out_dir):
+    """
+    Export the transformer of a sentence-transformers model to ONNX, with its
+    tokenizer and pooling settings, plus a dynamic-int8 quantized copy.
+    Needs torch once; serving the export only needs onnxruntime + tokenizers.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    st = SentenceTransformer(model_name, device="cpu")
+    transformer = st[0]
+    hf_model = transformer.auto_model.eval()
+    tokenizer = transformer.tokenizer
+    pooling = next((m for m in st if type(m).__name__ == "Pooling"), None)
+
+    dummy = tokenizer(["Section 302 of the Indian Penal Code"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+
+    class LastHiddenState(torch.nn.Module):
+        # Positional inputs in `input_names` order, passed on by keyword
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)), return_dict=True).last_hidden_state
+
+    axes = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            LastHiddenState(hf_model),
+            tuple(dummy[name] for name in input_names),
+            str(out_dir / "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: axes for name in input_names + ["last_hidden_state"]},
+            opset_version=17,
+            dynamo=False,
+        )
+    quantize_dynamic(str(out_dir / "model.onnx"), str(out_dir / "model.int8.onnx"), weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(str(out_dir))
+    meta = {
+        "model_name": model_name,
+        "inputs": input_names,
+        "pooling": _pooling_mode(pooling),
+        "normalize": any(type(m).__name__ == "Normalize" for m in st),
+        "max_seq_length": st.max_seq_length,
+        "dimension": st.get_sentence_embedding_dimension(),
+        "pad_token": tokenizer.pad_token,
+        "pad_id": tokenizer.pad_token_id,
+    }
+    with open(out_dir / ONNX_META, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    print(f"📤 Exported {model_name} to ONNX → {out_dir}")
+    return out_dir
+
+class OnnxEmbedder:
+    """
+    The same model run by ONNX Runtime on CPU, optionally with dynamic-int8
+    weights. Mirrors `SentenceTransformer.encode`: length-sorted batches,
+    the model's pooling, then L2 normalisation when the model applies it.
+    """
+
+    def __init__(self, onnx_dir, quantized=False, threads=0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.onnx_dir = Path(onnx_dir)
+        with open(self.onnx_dir / ONNX_META, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.model_name = self.meta["model_name"]
+        self.max_seq_length = self.meta["max_seq_length"]
+        self.backend = "onnx-int8" if quantized else "onnx"
+
+        self.tokenizer = Tokenizer.from_file(str(self.onnx_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=self.meta["pad_id"], pad_token=self.meta["pad_token"])
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        model_file = "model.int8.onnx" if quantized else "model.onnx"
+        self.session = ort.InferenceSession(
+            str(self.onnx_dir / model_file), options, providers=["CPUExecutionProvider"]
+        )
+
+    @property
+    def dimension(self):
+        return self.meta["dimension"]
+
+    def _forward(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {name: feeds[name] for name in self.meta["inputs"]}
+        hidden = self.session.run(["last_hidden_state"], feeds)[0]
+
+        if self.meta["pooling"] == "cls":
+            pooled = hidden[:, 0]
+        else:
+            mask = feeds["attention_mask"][:, :, None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.meta["normalize"]:
+            pooled = pooled / np.linalg.norm(pooled, axis=1, keepdims=True).clip(1e-12)
+        return pooled.astype(np.float32)
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        # Longest first, so each batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            out[rows] = self._forward([texts[i] for i in rows])
+        return out[0] if single else out
+
+def load_embedder(backend, model_name, onnx_dir=None, threads=0):
+    """
+    Build the embedder for `backend` ("torch", "onnx" or "onnx-int8").
+    ONNX backends export the model on first use when `onnx_dir` is empty.
+    """
+    if backend == "torch":
+        return TorchEmbedder(model_name)
+    if backend in ("onnx", "onnx-int8"):
+        onnx_dir = onnx_dir or default_onnx_dir(model_name)
+        if not os.path.exists(os.path.join(onnx_dir, ONNX_META)):
+            export_onnx(model_name, onnx_dir)
+        return OnnxEmbedder(onnx_dir, quantized=backend == "onnx-int8", threads=threads)
+    raise ValueError(f"Unknown embedder backend {backend!r} (expected one of {BACKENDS})")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a sentence-transformers model to ONNX (+ int8)")
+    parser.add_argument("--model", default="BAAI/bge-small-en-v1.5")
+    parser.add_argument("--out", default=None, help="defaults to ./models/<model>-onnx")
+    args = parser.parse_args()
+    export_onnx(args.model, args.out or default_onnx_dir(args.model))
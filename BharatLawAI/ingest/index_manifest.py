@@ -0,0 +1,115 @@
+# ingest/index_manifest.py
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def embedder_fingerprint(model):
+    """Embedder identity as "model@backend", e.g. "BAAI/bge-small-en-v1.5@onnx"."""
+    return f"{getattr(model, 'model_name', type(model).__name__)}@{getattr(model, 'backend', '')}"
+
+
+def content_hash(document, metadata, embedder=""):
+    """Stable hash of a chunk's text, metadata and the embedder that produced its vector"""
+    payload = json.dumps([document, metadata, embedder], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class IndexManifest:
+    """
+    Content-hash manifest of the chunks stored in a Chroma collection.
+
+    The manifest itself is JSON: the embedder fingerprint the vectors were
+    built with and a map of chunk ID → hash. Progress made during a run is
+    appended to a checkpoint log next to it, one line per stored or
+    deleted chunk, so an interrupted ingest can replay the log and resume
+    instead of re-embedding everything. `save()` folds the log back into the
+    manifest once the run completes.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.hashes = {}
+        self.embedder = None  # fingerprint of the embedder behind the stored hashes
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if "hashes" in data:
+                self.embedder = data.get("embedder")
+                self.hashes = data["hashes"]
+            else:
+                self.hashes = data  # flat ID → hash map written before fingerprints were stored
+
+        if self.log_path.exists():
+            resumed = 0
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn final line from a crash
+                    if "embedder" in entry:
+                        self.embedder = entry["embedder"]
+                        continue
+                    if entry["hash"] is None:
+                        self.hashes.pop(entry["id"], None)
+                    else:
+                        self.hashes[entry["id"]] = entry["hash"]
+                    resumed += 1
+            print(f"♻️ Resuming from checkpoint: {resumed} entries replayed")
+
+        self._log = None
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def built_with(self, model):
+        """False when the stored vectors came from a different (or unrecorded) embedder"""
+        return not self.hashes or self.embedder == embedder_fingerprint(model)
+
+    def is_current(self, uid, digest):
+        return self.hashes.get(uid) == digest
+
+    def _append(self, entries):
+        if self._log is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._log = open(self.log_path, "a", encoding="utf-8")
+            self._log.write(json.dumps({"embedder": self.embedder}) + "\n")
+        for uid, digest in entries:
+            self._log.write(json.dumps({"id": uid, "hash": digest}) + "\n")
+            if digest is None:
+                self.hashes.pop(uid, None)
+            else:
+                self.hashes[uid] = digest
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def record(self, ids, digests):
+        """Checkpoint chunks that have been written to the collection"""
+        self._append(zip(ids, digests))
+
+    def forget(self, ids):
+        """Checkpoint chunks that have been deleted from the collection"""
+        self._append((uid, None) for uid in ids)
+
+    def save(self):
+        """Write the full manifest atomically and drop the checkpoint log"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder, "hashes": self.hashes}, f)
+        os.replace(tmp_path, self.path)
+        if self.log_path.exists():
+            self.log_path.unlink()
+
+    def clear(self):
+        """Forget every chunk, e.g. before a full rebuild"""
+        self.hashes = {}
+        self.save()
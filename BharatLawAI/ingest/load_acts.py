@@ -1,28 +1,40 @@
+import argparse
 import json
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from tqdm import tqdm
 
-ACTS_DIR = "/mnt/d/Indian Legal Assistant/data/annotatedCentralActs"
-OUTPUT_FILE = "/mnt/d/Indian Legal Assistant/data/parsed_acts.jsonl"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ingest.section_index import build_index
 
-def flatten_paragraphs(paragraphs):
-    """Recursively flatten paragraphs into a single text string"""
-    text_blocks = []
+ACTS_DIR = "data/annotatedCentralActs"
+OUTPUT_FILE = "data/parsed_acts.jsonl"
+
+_EXHAUSTED = object()
 
-    def recurse(obj):
-        if isinstance(obj, str):
-            text_blocks.append(obj)
+def iter_text_blocks(paragraphs):
+    """Yield the strings nested in paragraphs depth-first, in document order"""
+    stack = [iter((paragraphs,))]
+    while stack:
+        obj = next(stack[-1], _EXHAUSTED)
+        if obj is _EXHAUSTED:
+            stack.pop()
+        elif isinstance(obj, str):
+            yield obj
         elif isinstance(obj, dict):
-            for val in obj.values():
-                recurse(val)
+            stack.append(iter(obj.values()))
         elif isinstance(obj, list):
-            for item in obj:
-                recurse(item)
+            stack.append(iter(obj))
 
-    recurse(paragraphs)
-    return "\n".join(text_blocks)
+def flatten_paragraphs(paragraphs):
+    """Flatten nested paragraphs into a single text string"""
+    return "\n".join(iter_text_blocks(paragraphs))
 
-def extract_sections_from_act(act_json):
+def extract_sections_from_act(act_json, default_act="Unknown Act"):
+    # Every record names its act, so chunk IDs and section lookups can tell "Section 1." of each act apart
+    act_title = (act_json.get("Act Title") or default_act).strip()
     sections = []
     parts = act_json.get("Parts", {})
     for part in parts.values():
@@ -36,29 +48,91 @@ def extract_sections_from_act(act_json):
                 "section_no": sec_no,
                 "heading": heading,
                 "part": part_name,
-                "text": text
+                "text": text,
+                "act": act_title
             })
     return sections
 
-def load_sections():
+def parse_act_file(fpath):
+    """Parse one act file into JSONL lines. Returns (lines, error)."""
+    try:
+        with open(fpath, encoding="utf-8") as f:
+            act = json.load(f)
+        sections = extract_sections_from_act(act, os.path.splitext(os.path.basename(fpath))[0])
+    except Exception as e:
+        return [], str(e)
+    return [json.dumps(sec, ensure_ascii=False) + "\n" for sec in sections], None
+
+def load_sections(acts_dir=ACTS_DIR):
     all_sections = []
-    for fname in tqdm(os.listdir(ACTS_DIR)):
-        fpath = os.path.join(ACTS_DIR, fname)
+    for fname in tqdm(os.listdir(acts_dir)):
+        fpath = os.path.join(acts_dir, fname)
         with open(fpath, encoding="utf-8") as f:
             try:
                 act = json.load(f)
-                sections = extract_sections_from_act(act)
+                sections = extract_sections_from_act(act, os.path.splitext(fname)[0])
                 all_sections.extend(sections)
             except Exception as e:
                 print(f"[!] Failed: {fname} → {e}")
     return all_sections
 
+def stream_sections(acts_dir=ACTS_DIR, output_file=OUTPUT_FILE, workers=None, max_in_flight=None):
+    """
+    Parse act files in a process pool and write sections to output_file as
+    each file finishes. At most max_in_flight files are parsed or waiting to
+    be written at once, so memory stays bounded regardless of corpus size.
+    workers=0 parses in-process. Returns the number of sections written.
+
+    Output goes to a temporary file that replaces output_file at the end, so
+    a running app reading the old file never sees it truncated.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_in_flight = max_in_flight or max(2 * workers, 1)
+    fnames = sorted(os.listdir(acts_dir))
+    written = 0
+    start = time.perf_counter()
+    tmp_file = output_file + ".tmp"
+
+    with open(tmp_file, "w", encoding="utf-8") as out_f, tqdm(total=len(fnames), unit="act") as bar:
+        def write(fname, lines, error):
+            nonlocal written
+            if error:
+                print(f"[!] Failed: {fname} → {error}")
+            out_f.writelines(lines)
+            written += len(lines)
+            bar.update(1)
+
+        if workers == 0:
+            for fname in fnames:
+                write(fname, *parse_act_file(os.path.join(acts_dir, fname)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = {}
+                for fname in fnames:
+                    if len(pending) >= max_in_flight:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(pending.pop(future), *future.result())
+                    pending[pool.submit(parse_act_file, os.path.join(acts_dir, fname))] = fname
+                for future in list(pending):
+                    write(pending.pop(future), *future.result())
+    os.replace(tmp_file, output_file)
+
+    elapsed = time.perf_counter() - start
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"⚡ Parsed {len(fnames)} acts → {written} sections in {elapsed:.1f}s ({rate:.0f} sections/sec)")
+    return written
+
 if __name__ == "__main__":
-    sections = load_sections()
-    print(f"✅ Loaded {len(sections)} legal sections.")
-    print("📌 Sample:", sections[0] if sections else "No data found.")
+    parser = argparse.ArgumentParser(description="Parse annotatedCentralActs JSON into parsed_acts.jsonl")
+    parser.add_argument("acts_dir", nargs="?", default=ACTS_DIR, help="directory of act JSON files")
+    parser.add_argument("output_file", nargs="?", default=OUTPUT_FILE, help="JSONL file to write")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count, 0 = in-process)")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="act files parsed or buffered at once")
+    args = parser.parse_args()
 
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as out_f:
-        for sec in sections:
-            out_f.write(json.dumps(sec, ensure_ascii=False) + "\n")
-    print(f"💾 Saved to {OUTPUT_FILE}")
+    count = stream_sections(args.acts_dir, args.output_file, args.workers, args.max_in_flight)
+    print(f"✅ Loaded {count} legal sections.")
+    print(f"💾 Saved to {args.output_file}")
+    build_index(args.output_file)
@@ -1,9 +1,15 @@
 # ingest/parse_indialaw_db.py
 
+import os
+import sys
 import sqlite3
 import json
+import time
 from pathlib import Path
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ingest.section_index import build_index
+
 DB_PATH = Path("data/raw_acts/indialaw.db")
 OUT_FILE = Path("data/parsed_acts.jsonl")
 
@@ -19,57 +25,89 @@ ACT_TABLES = {
     "mva": "Motor Vehicles Act, 1988",
 }
 
-def already_exists(section_no, act_title):
+FETCH_SIZE = 1000   # rows pulled from SQLite per fetchmany call
+WRITE_BATCH = 500   # records buffered before each write to OUT_FILE
+
+def load_existing_keys():
+    """Index the (section_no, act) pairs already in OUT_FILE with a single pass"""
+    keys = set()
     if not OUT_FILE.exists():
-        return False
+        return keys
     with open(OUT_FILE, "r", encoding="utf-8") as f:
         for line in f:
             try:
                 data = json.loads(line)
-                if data.get("section_no") == section_no and data.get("act") == act_title:
-                    return True
-            except:
+            except json.JSONDecodeError:
                 continue
-    return False
+            keys.add((data.get("section_no"), data.get("act")))
+    return keys
 
 def parse_and_append():
+    start = time.perf_counter()
+    existing = load_existing_keys()
+    print(f"🔑 Indexed {len(existing)} existing sections in {OUT_FILE}")
+
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    total_added = total_skipped = 0
+    buffer = []
+
     with open(OUT_FILE, "a", encoding="utf-8") as out_f:
         for table, act_title in ACT_TABLES.items():
-            print(f"\n📘 Parsing {act_title} ({table})")
+            added = skipped = 0
             try:
                 cursor.execute(f"SELECT * FROM {table}")
-                rows = cursor.fetchall()
-
-                for row in rows:
-                    section_no = str(row[0]).strip()
-                    heading = str(row[1]).strip()
-                    text = str(row[2]).strip()
-
-                    if not text:
-                        continue
-
-                    record = {
-                        "section_no": f"Section {section_no}.",
-                        "heading": heading,
-                        "text": text,
-                        "part": f"PART FROM {act_title}",
-                        "act": act_title
-                    }
-
-                    if not already_exists(record["section_no"], record["act"]):
-                        out_f.write(json.dumps(record, ensure_ascii=False) + "\n")
-                        print(f"✅ Added {record['section_no']} from {act_title}")
-                    else:
-                        print(f"⏭️ Skipped duplicate {record['section_no']}")
+
+                while True:
+                    rows = cursor.fetchmany(FETCH_SIZE)
+                    if not rows:
+                        break
+
+                    for row in rows:
+                        section_no = str(row[0]).strip()
+                        heading = str(row[1]).strip()
+                        text = str(row[2]).strip()
+
+                        if not text:
+                            continue
+
+                        record = {
+                            "section_no": f"Section {section_no}.",
+                            "heading": heading,
+                            "text": text,
+                            "part": f"PART FROM {act_title}",
+                            "act": act_title
+                        }
+
+                        key = (record["section_no"], record["act"])
+                        if key in existing:
+                            skipped += 1
+                            continue
+
+                        existing.add(key)
+                        buffer.append(json.dumps(record, ensure_ascii=False) + "\n")
+                        added += 1
+
+                        if len(buffer) >= WRITE_BATCH:
+                            out_f.writelines(buffer)
+                            buffer.clear()
 
             except Exception as e:
                 print(f"⚠️ Failed to parse table {table}: {e}")
 
+            out_f.writelines(buffer)
+            buffer.clear()
+            total_added += added
+            total_skipped += skipped
+            print(f"📘 {act_title} ({table}): ✅ {added} added, ⏭️ {skipped} duplicates skipped")
+
     conn.close()
-    print("\n✅ Done parsing all acts into parsed_acts.jsonl")
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Done parsing {len(ACT_TABLES)} acts into {OUT_FILE.name}: "
+          f"{total_added} added, {total_skipped} skipped in {elapsed:.1f}s")
+
+    build_index(OUT_FILE)
 
 if __name__ == "__main__":
     parse_and_append()
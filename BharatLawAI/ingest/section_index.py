@@ -0,0 +1,196 @@
+# ingest/section_index.py
+
+import json
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+
+DATA_FILE = Path("data/parsed_acts.jsonl")
+INDEX_VERSION = 1
+
+def normalize_section(section):
+    """Strip prefixes like 'Section', dots, etc. ("Section 498A." → "498a")"""
+    return re.sub(r"[^a-zA-Z0-9]", "", section.lower().replace("section", "").strip())
+
+def normalize_act(act):
+    """Lowercase alphanumerics only ("Indian Penal Code, 1860" → "indianpenalcode1860")"""
+    return re.sub(r"[^a-z0-9]", "", act.lower())
+
+_ACT_KEYS = None
+
+def act_key(act):
+    """
+    Canonical act key stored in chunk metadata and matched by citations: the
+    table abbreviation for the acts in ACT_TABLES, however they are spelled
+    ("IPC", "Indian Penal Code, 1860" → "ipc"), otherwise normalize_act(act).
+    """
+    global _ACT_KEYS
+    if _ACT_KEYS is None:
+        from ingest.parse_indialaw_db import ACT_TABLES
+        keys = {}
+        for table, title in ACT_TABLES.items():
+            for alias in (table, title, re.sub(r",?\s*\d{4}$", "", title)):
+                keys[normalize_act(alias)] = table
+        _ACT_KEYS = keys
+    key = normalize_act(act)
+    return _ACT_KEYS.get(key, key)
+
+def index_path_for(jsonl_path):
+    jsonl_path = Path(jsonl_path)
+    return jsonl_path.with_name(jsonl_path.name + ".idx")
+
+def _file_version(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def build_index(jsonl_path=DATA_FILE, index_path=None):
+    """
+    Scan parsed_acts.jsonl once and write a side index mapping
+    (normalized act, normalized section) → [byte offset, length] of each record.
+    """
+    # Deferred so parse_indialaw_db can import this module at the top
+    from ingest.parse_indialaw_db import ACT_TABLES
+
+    jsonl_path = Path(jsonl_path)
+    index_path = Path(index_path) if index_path else index_path_for(jsonl_path)
+
+    entries = {}
+    act_names = {}
+    offset = 0
+    with open(jsonl_path, "rb") as f:
+        for raw in f:
+            length = len(raw)
+            try:
+                row = json.loads(raw)
+            except json.JSONDecodeError:
+                offset += length
+                continue
+            act_name = (row.get("act") or "Unknown Act").strip()
+            act_key = normalize_act(act_name)
+            section_key = normalize_section(row.get("section_no", ""))
+            act_names.setdefault(act_key, act_name)
+            entries.setdefault(act_key, {}).setdefault(section_key, []).append([offset, length])
+            offset += length
+
+    # Abbreviations ("ipc") and year-less titles ("indianpenalcode") resolve to the full act
+    aliases = {}
+    for act_key, act_name in act_names.items():
+        aliases[normalize_act(re.sub(r",?\s*\d{4}$", "", act_name))] = act_key
+    for table, title in ACT_TABLES.items():
+        if normalize_act(title) in act_names:
+            aliases[table] = normalize_act(title)
+
+    index = {
+        "version": INDEX_VERSION,
+        "source": _file_version(jsonl_path),
+        "acts": act_names,
+        "aliases": aliases,
+        "entries": entries,
+    }
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, index_path)
+
+    count = sum(len(offsets) for sections in entries.values() for offsets in sections.values())
+    print(f"🗂️ Indexed {count} sections from {len(act_names)} acts → {index_path}")
+    return index_path
+
+class SectionIndex:
+    """
+    Exact (act, section) lookups over parsed_acts.jsonl.
+
+    The side index is loaded into dicts and a lookup is a dict hit plus one
+    seek-and-read per record. Records are read rather than memory-mapped: a
+    mapped page past the end of a JSONL truncated by a re-ingest kills the
+    process with SIGBUS. When the JSONL changes on disk, the next lookup
+    reloads (or rebuilds) the index and reopens the file.
+    """
+
+    def __init__(self, jsonl_path=DATA_FILE, index_path=None):
+        self.jsonl_path = Path(jsonl_path)
+        self.index_path = Path(index_path) if index_path else index_path_for(self.jsonl_path)
+        # Serialises seek + read on the shared handle and reloads; callers come from several threads
+        self._lock = threading.RLock()
+        self._file = None
+        self._load()
+
+    def _load(self):
+        index = None
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        if (index is None or index.get("version") != INDEX_VERSION
+                or index.get("source") != _file_version(self.jsonl_path)):
+            print(f"⚠️ Section index missing or stale, rebuilding {self.index_path}")
+            build_index(self.jsonl_path, self.index_path)
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+
+        self.act_names = index["acts"]
+        self.aliases = index["aliases"]
+        self.entries = index["entries"]
+        self._version = index["source"]
+
+        previous, self._file = self._file, open(self.jsonl_path, "rb")
+        if previous is not None:
+            previous.close()
+
+    def _refresh(self):
+        """Reload if parsed_acts.jsonl was rewritten or appended to since the index was loaded"""
+        try:
+            changed = _file_version(self.jsonl_path) != self._version
+        except FileNotFoundError:
+            return  # mid-replace; keep serving the file that is already open
+        if changed:
+            print(f"♻️ {self.jsonl_path} changed on disk, reloading the section index")
+            self._load()
+
+    def acts(self):
+        """Display names of every indexed act"""
+        with self._lock:
+            self._refresh()
+            return sorted(self.act_names.values())
+
+    def resolve_act(self, act):
+        """Map an act title, year-less title or abbreviation to its index key"""
+        key = normalize_act(act)
+        if key in self.entries:
+            return key
+        return self.aliases.get(key)
+
+    def _read(self, offset, length):
+        self._file.seek(offset)
+        return json.loads(self._file.read(length))
+
+    def lookup(self, act, section):
+        """
+        Return every record for `section` in `act`, in file order.
+        `act=None` (or "all") searches every act.
+        """
+        with self._lock:
+            self._refresh()
+            return self._lookup(act, section)
+
+    def _lookup(self, act, section):
+        section_key = normalize_section(section)
+        if act is None or normalize_act(act) in ("all", "allacts"):
+            act_keys = self.entries.keys()
+        else:
+            act_key = self.resolve_act(act)
+            act_keys = [act_key] if act_key else []
+
+        spans = []
+        for act_key in act_keys:
+            spans.extend(self.entries[act_key].get(section_key, ()))
+        return [self._read(offset, length) for offset, length in sorted(spans)]
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+if __name__ == "__main__":
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+    build_index(sys.argv[1] if len(sys.argv) > 1 else DATA_FILE)
@@ -0,0 +1,255 @@
+# ingest/vector_store.py
+
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+STORE_VERSION = 1
+BLOCK_ROWS = 2048  # rows converted and scored at a time for float16 / int8 vectors
+QUANTIZATIONS = ("int8", "binary")
+
+# Set bits per byte, for Hamming distance on numpy < 2.0
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def _popcount(bits):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits)
+    return _POPCOUNT[bits]
+
+# Chroma distance for a cosine similarity s between unit vectors, per collection space
+_DISTANCE = {
+    "cosine": lambda s: 1.0 - s,
+    "ip": lambda s: 1.0 - s,
+    "l2": lambda s: 2.0 - 2.0 * s,  # squared L2 of unit vectors
+}
+
+def _write_strings(directory, name, values):
+    """UTF-8 blob plus int64 offsets, so one string can be read without loading the rest"""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(b) for b in encoded])
+    with open(directory / f"{name}.bin", "wb") as f:
+        for b in encoded:
+            f.write(b)
+    np.save(directory / f"{name}.offsets.npy", offsets)
+
+class StringTable:
+    """Read-only, memory-mapped list of strings written by `_write_strings`"""
+
+    def __init__(self, directory, name):
+        self.offsets = np.load(directory / f"{name}.offsets.npy", mmap_mode="r")
+        path = directory / f"{name}.bin"
+        self.blob = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.zeros(0, np.uint8)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+def quantize(embeddings, directory, kind):
+    """
+    Write a compact copy of unit-normalised `embeddings` for first-pass scoring:
+
+        int8     embeddings.int8.npy + int8_scale.npy, one scale per dimension
+                 (max |x| / 127), 4x smaller than float32
+        binary   embeddings.bits.npy, the sign bit of every dimension packed
+                 8 per byte, 32x smaller than float32
+    """
+    directory = Path(directory)
+    if kind == "int8":
+        scale = np.zeros(embeddings.shape[1], dtype=np.float32)
+        for start in range(0, len(embeddings), BLOCK_ROWS):
+            block = np.abs(np.asarray(embeddings[start:start + BLOCK_ROWS], dtype=np.float32))
+            np.maximum(scale, block.max(axis=0), out=scale)
+        scale = np.where(scale > 0, scale / 127.0, 1.0).astype(np.float32)
+        codes = np.lib.format.open_memmap(
+            directory / "embeddings.int8.npy", mode="w+", dtype=np.int8, shape=embeddings.shape
+        )
+        for start in range(0, len(embeddings), BLOCK_ROWS):
+            block = np.asarray(embeddings[start:start + BLOCK_ROWS], dtype=np.float32)
+            codes[start:start + len(block)] = np.clip(np.rint(block / scale), -127, 127)
+        codes.flush()
+        np.save(directory / "int8_scale.npy", scale)
+    elif kind == "binary":
+        bits = np.packbits(np.asarray(embeddings) > 0, axis=1)
+        np.save(directory / "embeddings.bits.npy", bits)
+    else:
+        raise ValueError(f"Unknown quantization {kind!r} (expected one of {QUANTIZATIONS})")
+
+def export_collection(collection, out_dir, dtype="float32", quantization=None, page_size=5000):
+    """
+    Copy every vector, document and metadata of a Chroma collection into a
+    flat store under `out_dir`:
+
+        embeddings.npy        (N, dim) unit-normalised, float32 or float16
+        ids / documents /     parallel string tables (metadata as JSON),
+        metadatas             read only for the rows a query returns
+        meta.json             count, dtype, quantization, distance space
+
+    With `quantization` ("int8" or "binary") a compact copy of the vectors
+    is written too; see `quantize`.
+    """
+    out_dir = Path(out_dir)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    total = collection.count()
+    ids, documents, metadatas = [], [], []
+    embeddings = None
+    for offset in range(0, total, page_size):
+        page = collection.get(
+            limit=page_size, offset=offset, include=["embeddings", "documents", "metadatas"]
+        )
+        vectors = np.asarray(page["embeddings"], dtype=np.float32)
+        if embeddings is None:
+            embeddings = np.lib.format.open_memmap(
+                tmp_dir / "embeddings.npy", mode="w+", dtype=dtype, shape=(total, vectors.shape[1])
+            )
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+        embeddings[len(ids):len(ids) + len(vectors)] = vectors
+        ids.extend(page["ids"])
+        documents.extend(doc or "" for doc in page["documents"])
+        metadatas.extend(json.dumps(meta or {}, ensure_ascii=False) for meta in page["metadatas"])
+
+    if embeddings is None:
+        embeddings = np.lib.format.open_memmap(tmp_dir / "embeddings.npy", mode="w+", dtype=dtype, shape=(0, 0))
+    embeddings.flush()
+    if quantization:
+        quantize(embeddings, tmp_dir, quantization)
+    del embeddings
+
+    _write_strings(tmp_dir, "ids", ids)
+    _write_strings(tmp_dir, "documents", documents)
+    _write_strings(tmp_dir, "metadatas", metadatas)
+
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+    with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "version": STORE_VERSION, "count": len(ids), "dtype": dtype,
+            "quantization": quantization, "space": space,
+        }, f)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    print(f"🧮 Exported {len(ids)} vectors ({dtype}{', ' + quantization if quantization else ''}) → {out_dir}")
+    return out_dir
+
+def _unit(query):
+    query = np.asarray(query, dtype=np.float32)
+    return query / (np.linalg.norm(query) + 1e-12)
+
+def _blockwise(matrix, query):
+    """`matrix @ query` in float32, converting BLOCK_ROWS rows at a time"""
+    out = np.empty(len(matrix), dtype=np.float32)
+    for start in range(0, len(out), BLOCK_ROWS):
+        block = np.asarray(matrix[start:start + BLOCK_ROWS], dtype=np.float32)
+        out[start:start + len(block)] = block @ query
+    return out
+
+class NumpyVectorStore:
+    """
+    Exact nearest-neighbour search over a store written by `export_collection`.
+
+    The embedding matrix is memory-mapped; a query is one matrix-vector
+    product (blockwise for float16) and an argpartition for the top k.
+    Distances follow the exported collection's space so thresholds tuned
+    against Chroma keep their meaning.
+
+    If the store was quantized, only the int8 or binary codes are held in
+    memory. They shortlist `rescore` candidates, which are then re-scored
+    exactly against the memory-mapped float vectors, so only those rows
+    are ever paged in.
+    """
+
+    def __init__(self, path, use_quantized=True, rescore=100):
+        self.path = Path(path)
+        with open(self.path / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported vector store version in {self.path}")
+
+        self.space = meta["space"]
+        self.embeddings = np.load(self.path / "embeddings.npy", mmap_mode="r")
+        self.ids = StringTable(self.path, "ids")
+        self.documents = StringTable(self.path, "documents")
+        self.metadatas = StringTable(self.path, "metadatas")
+
+        self.quantization = meta.get("quantization") if use_quantized else None
+        self.rescore = rescore
+        if self.quantization == "int8":
+            self.codes = np.load(self.path / "embeddings.int8.npy")
+            self.scale = np.load(self.path / "int8_scale.npy")
+        elif self.quantization == "binary":
+            self.codes = np.load(self.path / "embeddings.bits.npy")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def resident_bytes(self):
+        """Bytes of vector data a query scans in full (the rest is paged in per hit)"""
+        if self.quantization:
+            return self.codes.nbytes + (self.scale.nbytes if self.quantization == "int8" else 0)
+        return self.embeddings.nbytes
+
+    def scores(self, query):
+        """Cosine similarity of `query` against every stored vector"""
+        query = _unit(query)
+        if self.embeddings.dtype == np.float32:
+            return self.embeddings @ query
+        return _blockwise(self.embeddings, query)
+
+    def _coarse_scores(self, query):
+        """Approximate similarity from the quantized codes (higher is closer)"""
+        query = _unit(query)
+        if self.quantization == "int8":
+            # codes * scale ≈ x, so fold the scale into the query once
+            return _blockwise(self.codes, query * self.scale)
+        # Fewer differing sign bits means a smaller angle
+        query_bits = np.packbits(query > 0)
+        return -_popcount(self.codes ^ query_bits).sum(axis=1, dtype=np.int32)
+
+    def search(self, query, k=5):
+        """Return [(row, distance)] for the `k` nearest rows, nearest first."""
+        k = min(k, len(self))
+        if k == 0:
+            return []
+        if self.quantization:
+            coarse = self._coarse_scores(query)
+            shortlist = min(len(self), max(k, self.rescore))
+            rows = np.sort(np.argpartition(-coarse, shortlist - 1)[:shortlist])
+            exact = np.asarray(self.embeddings[rows], dtype=np.float32) @ _unit(query)
+            order = np.argsort(-exact)[:k]
+            rows, scores = rows[order], exact[order]
+        else:
+            scores = self.scores(query)
+            rows = np.argpartition(-scores, k - 1)[:k]
+            rows = rows[np.argsort(-scores[rows])]
+            scores = scores[rows]
+        distance = _DISTANCE[self.space]
+        return [(int(row), float(distance(score))) for row, score in zip(rows, scores)]
+
+    def row(self, i):
+        """(id, document, metadata) of row `i`"""
+        return self.ids[i], self.documents[i], json.loads(self.metadatas[i])
+
+if __name__ == "__main__":
+    from chromadb import PersistentClient
+
+    parser = argparse.ArgumentParser(description="Export a Chroma collection to a NumPy vector store")
+    parser.add_argument("--chroma", default="./chroma_db")
+    parser.add_argument("--collection", default="legal_assistant")
+    parser.add_argument("--out", default=None, help="defaults to <chroma>/<collection>.npstore")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--quantize", choices=QUANTIZATIONS, default=None,
+                        help="also write int8 or binary codes for a quantized first pass")
+    args = parser.parse_args()
+
+    client = PersistentClient(path=args.chroma)
+    out = args.out or os.path.join(args.chroma, f"{args.collection}.npstore")
+    export_collection(client.get_collection(args.collection), out, dtype=args.dtype, quantization=args.quantize)
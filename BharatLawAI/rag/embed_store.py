@@ -1,54 +1,89 @@
 # rag/embed_store.py
 
 from chromadb import PersistentClient
-from sentence_transformers import SentenceTransformer
-import json, os, re
-from tqdm import tqdm
-
-# Initialize Sentence Transformer model
-model = SentenceTransformer("BAAI/bge-small-en-v1.5")
-
-# Initialize Chroma persistent client
-chroma_client = PersistentClient(path="./chroma_db")
-
-# Optional: delete old collection to start clean
-chroma_client.delete_collection("legal_assistant")
-
-# Create fresh collection
-collection = chroma_client.get_or_create_collection("legal_assistant")
-
-# Chunking function (split by word count)
-def chunk_text(text, max_words=200):
-    words = text.split()
-    return [" ".join(words[i:i+max_words]) for i in range(0, len(words), max_words)]
-
-# Load parsed legal sections
-with open("data/parsed_acts.jsonl", "r", encoding="utf-8") as f:
-    for line in tqdm(f, desc="🔁 Embedding & Storing"):
-        record = json.loads(line)
-        chunks = chunk_text(record["text"])
-
-        for idx, chunk in enumerate(chunks):
-            # Generate stable ID
-            act = record.get("act", "UNKNOWN_ACT").replace(" ", "_")
-            section = re.sub(r"[^\w]", "", record["section_no"])  # clean section_no
-            uid = f"{act}_{section}_{idx}"
-
-            embedding = model.encode(chunk).tolist()
-            metadata = {
-                "section_no": record["section_no"],
-                "heading": record["heading"],
-                "part": record.get("part", ""),
-                "act": record.get("act", "UNKNOWN_ACT"),
-                "chunk_index": idx
-            }
-
-            # Add chunk to ChromaDB
-            collection.add(
-                documents=[chunk],
-                ids=[uid],
-                metadatas=[metadata],
-                embeddings=[embedding]
-            )
-
-print("✅ Done: All chunks embedded and stored in ChromaDB.")
+import argparse, os, sys
+
+# ✅ Access shared ingest modules from the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ingest.bm25_index import build_bm25_index
+from ingest.chunking import Chunker, iter_chunks
+from ingest.embed_pipeline import embed_and_write
+from ingest.embedders import BACKENDS, load_embedder
+from ingest.index_manifest import IndexManifest, embedder_fingerprint
+from ingest.vector_store import QUANTIZATIONS, export_collection
+
+DATA_FILE = "data/parsed_acts.jsonl"
+COLLECTION = "legal_assistant"
+MANIFEST_FILE = f"./chroma_db/{COLLECTION}.manifest.json"
+NUMPY_STORE = f"./chroma_db/{COLLECTION}.npstore"
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed parsed legal sections into ChromaDB")
+    parser.add_argument("--input", default=DATA_FILE, help="parsed_acts.jsonl to embed")
+    parser.add_argument("--batch-size", type=int, default=64, help="chunks per encode forward pass")
+    parser.add_argument("--write-batch", type=int, default=1024, help="chunks per Chroma upsert call")
+    parser.add_argument("--workers", type=int, default=0, help="encoder processes (0/1 = in-process)")
+    parser.add_argument("--embedder", choices=BACKENDS, default="torch",
+                        help="embedding backend (onnx / onnx-int8 export the model on first use)")
+    parser.add_argument("--rebuild", action="store_true", help="drop the collection and re-embed everything")
+    parser.add_argument("--store-dtype", choices=["float32", "float16"], default="float32",
+                        help="precision of the NumPy vector store exported for VECTOR_BACKEND=numpy")
+    parser.add_argument("--quantize", choices=QUANTIZATIONS, default=None,
+                        help="also store int8/binary codes so the backend keeps only those in memory")
+    parser.add_argument("--chunk-tokens", type=int, default=0,
+                        help="max tokens per chunk incl. context line (0 = the embedder's max sequence length)")
+    parser.add_argument("--chunk-overlap", type=int, default=32, help="tokens repeated between consecutive chunks")
+    parser.add_argument("--chunk-report", action="store_true",
+                        help="only chunk the input and print the chunk-length distribution")
+    args = parser.parse_args()
+
+    # Initialize the embedding model (same abstraction the backend queries with)
+    model = load_embedder(args.embedder, "BAAI/bge-small-en-v1.5")
+
+    # Chunks are measured with the embedder's own tokenizer, so none get truncated
+    chunker = Chunker.for_embedder(model, args.chunk_tokens, args.chunk_overlap)
+    if args.chunk_report:
+        for _ in iter_chunks(args.input, chunker):
+            pass
+        chunker.stats.report()
+        return
+
+    # Initialize Chroma persistent client
+    chroma_client = PersistentClient(path="./chroma_db")
+    manifest = IndexManifest(MANIFEST_FILE)
+
+    # Vectors from another model must not share a collection with new ones
+    # (same dimension or not), so a model or backend switch forces a rebuild
+    if not args.rebuild and not manifest.built_with(model):
+        print(f"♻️ Collection was embedded with {manifest.embedder or 'an unrecorded model'}, "
+              f"now {embedder_fingerprint(model)}: rebuilding")
+        args.rebuild = True
+
+    # Optional: delete old collection to start clean
+    if args.rebuild:
+        try:
+            chroma_client.delete_collection(COLLECTION)
+        except Exception:
+            pass  # nothing to drop yet
+        manifest.clear()
+
+    # Only new or changed chunks are embedded; the collection stays queryable meanwhile
+    collection = chroma_client.get_or_create_collection(COLLECTION)
+
+    embed_and_write(
+        iter_chunks(args.input, chunker), model, collection,
+        batch_size=args.batch_size, write_batch=args.write_batch, workers=args.workers,
+        manifest=manifest
+    )
+
+    print("✅ Done: All chunks embedded and stored in ChromaDB.")
+    chunker.stats.report()
+
+    # Flat copy of the vectors for the backend's exact NumPy retriever
+    export_collection(collection, NUMPY_STORE, dtype=args.store_dtype, quantization=args.quantize)
+
+    # Lexical index over the same chunks, for hybrid retrieval in the backend
+    build_bm25_index(args.input, chunker=chunker)
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,47 @@
-from sentence_transformers import SentenceTransformer
 from chromadb import PersistentClient
 import ollama
+import os, sys
 
-# Init embedder and DB
-embedder = SentenceTransformer("BAAI/bge-small-en-v1.5")
-chroma = PersistentClient(path="./chroma_db")
-collection = chroma.get_collection("legal_assistant")
+# ✅ Access shared ingest modules from the project root
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ingest.chunking import strip_context
+from ingest.embedders import load_embedder
+
+MODEL_NAME = "BAAI/bge-small-en-v1.5"
+LLM_MODEL = "llama3"
+NO_CONTEXT_NOTICE = "⚠️ *No relevant sections found in the database. This is a general response:*\n\n"
+
+# Loaded on first use, not at import; the Streamlit app holds its own
+# copies in st.cache_resource and passes them in
+_embedder = None
+_collection = None
+
+def load_embedding_model():
+    """Embedder for EMBEDDING_BACKEND ("torch", "onnx" or "onnx-int8", as in the backend)"""
+    return load_embedder(os.getenv("EMBEDDING_BACKEND", "torch"), MODEL_NAME)
+
+def load_collection():
+    return PersistentClient(path="./chroma_db").get_collection("legal_assistant")
+
+def _defaults(embedder, collection):
+    global _embedder, _collection
+    if embedder is None:
+        if _embedder is None:
+            _embedder = load_embedding_model()
+        embedder = _embedder
+    if collection is None:
+        if _collection is None:
+            _collection = load_collection()
+        collection = _collection
+    return embedder, collection
+
+def stream_legal_assistant(question: str, k: int = 5, embedder=None, collection=None):
+    """
+    Generator of answer text pieces as the LLM produces them.
+    Retrieval runs before the first piece is yielded.
+    """
+    embedder, collection = _defaults(embedder, collection)
 
-def query_legal_assistant(question: str, k: int = 5) -> str:
     # Step 1: Embed the query
     query_embedding = embedder.encode(question).tolist()
 
@@ -25,21 +59,16 @@ Answer the following legal question to the best of your general knowledge (even
 Question: {question}
 Answer:"""
 
-        response = ollama.chat(
-            model="llama3",
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        return "⚠️ *No relevant sections found in the database. This is a general response:*\n\n" + response["message"]["content"]
+        yield NO_CONTEXT_NOTICE
+    else:
+        # Step 3: Build context from retrieved (chunks carry their own "[Act | Section]" line; the header replaces it)
+        context = "\n\n".join([
+            f"{m.get('section_no', '')} - {m.get('heading', '')}\n{strip_context(doc)}"
+            for doc, m in zip(docs, metadatas)
+        ])
 
-    # Step 3: Build context from retrieved
-    context = "\n\n".join([
-        f"{m['section_no']} - {m['heading']}\n{doc}"
-        for doc, m in zip(docs, metadatas)
-    ])
-
-    # Step 4: Ask LLM with context
-    prompt = f"""You are a helpful Indian Legal Assistant.
+        # Step 4: Ask LLM with context
+        prompt = f"""You are a helpful Indian Legal Assistant.
 Use the following legal sections to answer the user's question.
 
 {context}
@@ -47,9 +76,10 @@ Use the following legal sections to answer the user's question.
 Question: {question}
 Answer:"""
 
-    response = ollama.chat(
-        model="llama3",
-        messages=[{"role": "user", "content": prompt}]
-    )
+    for chunk in ollama.chat(model=LLM_MODEL, messages=[{"role": "user", "content": prompt}], stream=True):
+        text = chunk["message"]["content"]
+        if text:
+            yield text
 
-    return response["message"]["content"]
+def query_legal_assistant(question: str, k: int = 5, embedder=None, collection=None) -> str:
+    return "".join(stream_legal_assistant(question, k, embedder, collection))